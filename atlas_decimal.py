@@ -0,0 +1,58 @@
+# DecimalNumber que reutiliza sus glifos en lugar de copiarlos en cada fotograma
+from manim import DecimalNumber
+import numpy as np
+
+# Atlas compartido: (carácter, clase, estilo) -> glifo original del que se copian los puntos
+_ATLAS = {}
+
+def _reset_points(mob, proto):
+    # Devolvemos el glifo a la forma del original copiando los puntos sobre los arrays que ya tiene
+    for dst, src in zip(mob.family_members_with_points(), proto.family_members_with_points()):
+        if dst.points.shape == src.points.shape:
+            np.copyto(dst.points, src.points)
+        else:
+            dst.points = src.points.copy()
+
+class AtlasDecimalNumber(DecimalNumber):
+    """
+        Sustituto de DecimalNumber para animaciones que cambian el valor en cada fotograma (por ejemplo
+        ChangeDecimalToValue). DecimalNumber crea una copia nueva de cada dígito cada vez que cambia
+        el valor; esta clase guarda los glifos que ya no se usan y los vuelve a colocar copiando
+        los puntos del atlas sobre sus propios arrays, así que tras los primeros fotogramas no se
+        crean objetos nuevos. La colocación (arrange, signo, comas...) es la misma de DecimalNumber,
+        por lo que el resultado es idéntico.
+
+        Los glifos se reciclan con un fotograma de retraso: DecimalNumber.set_value pone a 0 los puntos
+        de los glifos anteriores, así que no se pueden reutilizar en el mismo cambio de valor.
+
+        Los parámetros son los mismos que los de DecimalNumber.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Glifos libres por clave del atlas
+        self._pool = {}
+        # Glifos del valor anterior; pasan a estar libres en el siguiente cambio
+        self._retired = []
+        super().__init__(*args, **kwargs)
+
+    def _set_submobjects_from_number(self, number):
+        for mob in self._retired:
+            self._pool.setdefault(mob._atlas_key, []).append(mob)
+        self._retired = [ mob for mob in self.submobjects if hasattr(mob, "_atlas_key") ]
+        super()._set_submobjects_from_number(number)
+
+    def _string_to_mob(self, string, mob_class = None, **kwargs):
+        if mob_class is None:
+            mob_class = self.mob_class
+        key = (string, mob_class, repr(sorted(kwargs.items())))
+        if key not in _ATLAS:
+            _ATLAS[key] = mob_class(string, **kwargs)
+        free = self._pool.get(key)
+        if free:
+            mob = free.pop()
+            _reset_points(mob, _ATLAS[key])
+        else:
+            mob = _ATLAS[key].copy()
+            mob._atlas_key = key
+        mob.font_size = self._font_size
+        return mob
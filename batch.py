@@ -0,0 +1,123 @@
+# Renderizado por lotes de la escena Prueba
+from manim import *
+import argparse
+import copy
+import json
+from pathlib import Path
+
+from main import Prueba
+
+class PruebaBatch(Prueba):
+    """
+        Renderiza muchas variantes (vector inicial, ángulo) de Prueba en una sola ejecución. El prefijo
+        (create_plane, create_matrix y create_angle) sólo depende del vector inicial, así que se renderiza
+        una vez por vector; después se guarda una copia del estado de la escena y, para cada ángulo, se
+        restaura esa copia y se renderiza únicamente la cola (rotate_vector + show_mul).
+
+        Cada paso se renderiza en su propia sección, de modo que los ficheros parciales del prefijo se
+        reutilizan tal cual al juntar el vídeo de cada variante.
+
+        Parámetros (atributos de clase)
+        ----------------
+            variants : lista de pares (vector inicial, ángulo en grados).
+
+        Métodos
+        ------------
+            snapshot : devuelve una copia del estado actual de la escena.
+            restore : restaura la escena a partir de una copia hecha con snapshot.
+    """
+    variants = [((1, 0), 90)]
+
+    def construct(self):
+        # Agrupamos los ángulos por vector inicial, manteniendo el orden en el que llegan
+        groups = {}
+        for pos, angle in self.variants:
+            groups.setdefault(tuple(pos), []).append(angle)
+
+        # Lista de (vector inicial, ángulo, ruta del vídeo) de las variantes renderizadas
+        self.variant_movies = []
+        for pos, angles in groups.items():
+            # Cada vector inicial empieza con la escena vacía
+            self.clear()
+            self.reset_sections()
+            self.pos_inicial = pos
+            first = self._next_section_index()
+            self.construct_prefix()
+            prefix_files = self._section_files(first)
+            snapshot = self.snapshot()
+
+            for angle in angles:
+                self.restore(snapshot)
+                first = self._next_section_index()
+                self.construct_tail(angle)
+                self._combine_variant(pos, angle, prefix_files + self._section_files(first))
+
+    def snapshot(self):
+        estado = { name : getattr(self, name) for name in self.state_attributes }
+        estado["mobjects"] = self.mobjects
+        estado["foreground_mobjects"] = self.foreground_mobjects
+        estado["section_chain"] = self.section_chain
+        # Copiamos todo junto para que las referencias compartidas (por ejemplo, self.vec_rot y
+        # self.label_group) sigan apuntando a los mismos objetos en la copia
+        return copy.deepcopy(estado)
+
+    def restore(self, snapshot):
+        # Volvemos a copiar para poder restaurar la misma copia varias veces
+        estado = copy.deepcopy(snapshot)
+        self.mobjects = estado.pop("mobjects")
+        self.foreground_mobjects = estado.pop("foreground_mobjects")
+        for name, value in estado.items():
+            setattr(self, name, value)
+
+    def _next_section_index(self):
+        # Posición que tendrá la siguiente sección. next_section quita antes la última si está vacía
+        # (por ejemplo, la "autocreated" del principio), así que entonces la nueva ocupa su lugar
+        sections = self.renderer.file_writer.sections
+        if sections and sections[-1].is_empty():
+            return len(sections) - 1
+        return len(sections)
+
+    def _section_files(self, first):
+        # Ficheros parciales de las secciones desde first (None si la animación no se escribió)
+        sections = self.renderer.file_writer.sections[first:]
+        return [ f for section in sections for f in section.partial_movie_files if f is not None ]
+
+    def _combine_variant(self, pos, angle, files):
+        writer = self.renderer.file_writer
+        if not files or not hasattr(writer, "movie_file_path"):
+            return
+        movie = Path(writer.movie_file_path)
+        output = movie.with_name("{}_{}_{}_{}{}".format(movie.stem, *pos, angle, movie.suffix))
+        writer.combine_files(files, output)
+        self.variant_movies.append((pos, angle, output))
+
+def load_variants(path):
+    """
+        Lee un fichero JSONL con una variante por línea, por ejemplo {"vector": [1, 0], "angle": 45}
+    """
+    variants = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                job = json.loads(line)
+                variants.append((tuple(job["vector"]), job["angle"]))
+    return variants
+
+def render_batch(variants, **config_overrides):
+    """
+        Renderiza todas las variantes en una sola escena y devuelve la lista de vídeos generados
+    """
+    scene_class = type("PruebaBatch", (PruebaBatch,), {"variants": list(variants)})
+    with tempconfig(config_overrides):
+        scene = scene_class()
+        scene.render()
+    return scene.variant_movies
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Renderiza variantes de Prueba reutilizando el prefijo")
+    parser.add_argument("variants", help = "fichero JSONL con los campos vector y angle")
+    parser.add_argument("-q", "--quality", default = "low_quality",
+                        help = "calidad de Manim (low_quality, medium_quality, high_quality...)")
+    args = parser.parse_args()
+    for pos, angle, path in render_batch(load_variants(args.variants), quality = args.quality):
+        print(pos, angle, path)
@@ -0,0 +1,302 @@
+# Benchmark por fases de la escena Prueba
+#
+# Ejemplos:
+#   python benchmark.py -q low_quality medium_quality -a 90 45 -o bench.json
+#   python benchmark.py -o nuevo.json --compare bench.json --threshold 0.1
+#   python benchmark.py -q high_quality --workers 4
+#   python benchmark.py --cloud -q low_quality high_quality
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Fases de Prueba que se miden (show_mul se ejecuta dentro de rotate_vector; los tiempos de cada fase
+# no incluyen los de las fases que contiene)
+PHASES = ("create_plane", "create_matrix", "create_angle", "rotate_vector", "show_mul")
+
+# Métricas en las que un valor mayor es peor (en frames_per_second es al revés)
+HIGHER_IS_WORSE = ("wall_time", "peak_rss_kb", "peak_rss_growth_kb", "latex_invocations", "mobjects", "points")
+
+def _measured(cls, name):
+    def method(self, *args, **kwargs):
+        self._phase_start(name)
+        try:
+            return getattr(super(cls, self), name)(*args, **kwargs)
+        finally:
+            self._phase_end(name)
+    method.__name__ = name
+    return method
+
+def _scene_class(angle, workers = 1):
+    from manim import config
+    from main import Prueba
+
+    class PruebaMedida(Prueba):
+        """
+            Prueba con las fases cronometradas. Cada fase guarda en self.phase_stats su tiempo, los
+            fotogramas que ha generado, las llamadas a LaTeX, cuánto ha subido la memoria máxima del
+            proceso durante la fase y el número de objetos y puntos en escena al acabar. La memoria
+            máxima del render completo está en el total.
+        """
+        angulo = angle
+        parallel_workers = workers
+
+        def setup(self):
+            super().setup()
+            self.phase_stats = {}
+            # Pila de fases abiertas: [nombre, inicio, tiempo de vídeo, llamadas a LaTeX, tiempo de hijas,
+            # memoria máxima al empezar, subida de memoria de las hijas]
+            self._stack = []
+
+        def _phase_start(self, name):
+            self._stack.append([name, time.perf_counter(), self.renderer.time, _latex_calls[0], 0.0, _peak_rss(), 0])
+
+        def _phase_end(self, name):
+            _, start, video_start, latex_start, children, rss_start, children_rss = self._stack.pop()
+            total = time.perf_counter() - start
+            # ru_maxrss es la memoria máxima desde que empezó el proceso, así que lo que se atribuye a la
+            # fase es lo que ha subido mientras se ejecutaba (sin contar sus fases hijas)
+            rss_growth = _peak_rss() - rss_start
+            members = self.get_mobject_family_members()
+            stats = self.phase_stats.setdefault(name, dict(wall_time = 0.0, frames = 0, latex_invocations = 0,
+                                                           peak_rss_growth_kb = 0))
+            stats["wall_time"] += total - children
+            stats["frames"] += int(round((self.renderer.time - video_start) * config.frame_rate))
+            stats["latex_invocations"] += _latex_calls[0] - latex_start
+            stats["peak_rss_growth_kb"] += rss_growth - children_rss
+            stats["mobjects"] = len(members)
+            stats["points"] = sum(len(mob.points) for mob in members)
+            if self._stack:
+                # El tiempo de esta fase no cuenta para la fase que la contiene
+                self._stack[-1][4] += total
+                self._stack[-1][2] += self.renderer.time - video_start
+                self._stack[-1][3] += _latex_calls[0] - latex_start
+                self._stack[-1][6] += rss_growth
+
+    for name in PHASES:
+        setattr(PruebaMedida, name, _measured(PruebaMedida, name))
+    return PruebaMedida
+
+def _peak_rss():
+    # Memoria máxima del proceso (en KB en Linux)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+# Contador de compilaciones de LaTeX del proceso actual
+_latex_calls = [0]
+
+def _count_latex():
+    from manim.utils import tex_file_writing
+    compile_tex = tex_file_writing.compile_tex
+
+    def counting_compile_tex(tex_file, tex_compiler, output_format):
+        # Sólo cuenta si el resultado no estaba ya en la caché de Manim
+        if not Path(tex_file).with_suffix(output_format).exists():
+            _latex_calls[0] += 1
+        return compile_tex(tex_file, tex_compiler, output_format)
+
+    tex_file_writing.compile_tex = counting_compile_tex
+
+def _run_one(quality, angle, media_dir, workers = 1):
+    # Se ejecuta en un proceso nuevo para que la memoria máxima sea la de este render
+    from manim import config, tempconfig
+    _count_latex()
+    overrides = {
+        "quality": quality,
+        "media_dir": media_dir,
+        "disable_caching": True,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }
+    with tempconfig(overrides):
+        scene = _scene_class(angle, workers)()
+        start = time.perf_counter()
+        scene.render()
+        wall = time.perf_counter() - start
+        frames = sum(stats["frames"] for stats in scene.phase_stats.values())
+    phases = scene.phase_stats
+    for stats in phases.values():
+        stats["frames_per_second"] = stats["frames"] / stats["wall_time"] if stats["wall_time"] else 0.0
+    total = dict(
+        wall_time = wall,
+        frames = frames,
+        frames_per_second = frames / wall if wall else 0.0,
+        peak_rss_kb = _peak_rss(),
+        latex_invocations = _latex_calls[0],
+    )
+    return dict(quality = quality, angle = angle, workers = workers, total = total, phases = phases)
+
+def _run_cloud(quality, media_dir):
+    # Coste por fotograma de RotacionNube (miles de flechas), medido con TracingScene
+    from manim import tempconfig
+    from main import RotacionNube
+    from point_cloud import ArrowCloud
+    from tracing import TracingScene
+    overrides = {
+        "quality": quality,
+        "media_dir": media_dir,
+        "disable_caching": True,
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+    }
+    with tempconfig(overrides):
+        scene_class = type("RotacionNubeMedida", (TracingScene, RotacionNube),
+                           { "trace_file": os.path.join(media_dir, "cloud_trace.json") })
+        scene = scene_class()
+        scene.render()
+    arrows = sum(len(mob.vectors) for mob in scene.mobjects if isinstance(mob, ArrowCloud))
+    plays = []
+    for event in scene.trace_events:
+        args = event["args"]
+        frames = max(args["frames"], 1)
+        plays.append(dict(
+            animations = args["animations"],
+            frames = args["frames"],
+            update_ms_per_frame = args["update_ms"] / frames,
+            rasterize_ms_per_frame = args["rasterize_ms"] / frames,
+            encode_ms_per_frame = args["encode_ms"] / frames,
+            total_ms_per_frame = event["dur"] / 1e3 / frames,
+        ))
+    return dict(quality = quality, arrows = arrows, plays = plays)
+
+def run_cloud(qualities, media_dir = None):
+    """
+        Renderiza RotacionNube para cada calidad, cada una en un proceso nuevo, y devuelve el coste
+        por fotograma de cada animación (actualizar la nube, dibujarla y escribirla en el vídeo).
+    """
+    results = []
+    for quality in qualities:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = _run_isolated(_run_cloud, quality, media_dir or tmp)
+        results.append(result)
+        for play in result["plays"]:
+            print("{} {} flechas, {}: {} fotogramas, {:.1f} ms/fotograma (actualizar {:.1f}, dibujar {:.1f}, escribir {:.1f})".format(
+                quality, result["arrows"], "+".join(play["animations"]), play["frames"], play["total_ms_per_frame"],
+                play["update_ms_per_frame"], play["rasterize_ms_per_frame"], play["encode_ms_per_frame"]))
+    return results
+
+def _child(conn, func, args):
+    try:
+        conn.send(func(*args))
+    except BaseException as e:
+        conn.send(RuntimeError("{}: {}".format(type(e).__name__, e)))
+    finally:
+        conn.close()
+
+def _run_isolated(func, *args):
+    # Proceso nuevo que no es daemon (a diferencia de los de un Pool), así que ParallelScene puede
+    # crear sus propios procesos y se mide también el render en paralelo
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex = False)
+    process = ctx.Process(target = _child, args = (sender, func, args))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = RuntimeError("el proceso del benchmark ha terminado sin resultado")
+    finally:
+        process.join()
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+def run(qualities, angles, media_dir = None, workers = 1):
+    """
+        Renderiza Prueba para cada calidad y ángulo, cada uno en un proceso nuevo, y devuelve los
+        resultados. Si no se indica media_dir, cada render usa un directorio temporal vacío (todas
+        las cachés frías). Con workers mayor que 1 las animaciones de parallel_frames se renderizan
+        en paralelo (ParallelScene).
+    """
+    results = []
+    for quality in qualities:
+        for angle in angles:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = _run_isolated(_run_one, quality, angle, media_dir or tmp, workers)
+            results.append(result)
+            print("{} {:>6}: {:.2f} s, {:.1f} fps".format(
+                quality, angle, result["total"]["wall_time"], result["total"]["frames_per_second"]))
+    return results
+
+def _metrics(results):
+    # (calidad, ángulo, fase) -> métricas
+    res = {}
+    for result in results:
+        res[(result["quality"], result["angle"], "total")] = result["total"]
+        for name, stats in result["phases"].items():
+            res[(result["quality"], result["angle"], name)] = stats
+    return res
+
+def compare(results, baseline, threshold):
+    """
+        Devuelve la lista de regresiones respecto a baseline: las métricas que han empeorado más de
+        threshold (en tanto por uno).
+    """
+    old = _metrics(baseline)
+    regressions = []
+    for key, stats in _metrics(results).items():
+        if key not in old:
+            continue
+        for metric, value in stats.items():
+            base = old[key].get(metric)
+            if not base:
+                continue
+            if metric in HIGHER_IS_WORSE:
+                change = (value - base) / base
+            elif metric == "frames_per_second":
+                change = (base - value) / base
+            else:
+                continue
+            if change > threshold:
+                regressions.append(dict(quality = key[0], angle = key[1], phase = key[2], metric = metric,
+                                        baseline = base, value = value, change = change))
+    return regressions
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark por fases de la escena Prueba")
+    parser.add_argument("-q", "--quality", nargs = "+", default = ["low_quality", "medium_quality"],
+                        help = "calidades de Manim que se renderizan")
+    parser.add_argument("-a", "--angle", nargs = "+", type = float, default = [90],
+                        help = "ángulos que se renderizan")
+    parser.add_argument("-o", "--output", default = "bench_output.json", help = "fichero JSON de resultados")
+    parser.add_argument("--media-dir", help = "directorio de Manim a reutilizar (por defecto, uno temporal)")
+    parser.add_argument("--workers", type = int, default = 1,
+                        help = "procesos para las animaciones en paralelo (por defecto, 1: en serie)")
+    parser.add_argument("--cloud", action = "store_true",
+                        help = "mide el coste por fotograma de RotacionNube en lugar de Prueba")
+    parser.add_argument("--compare", help = "fichero JSON con los resultados de referencia")
+    parser.add_argument("--threshold", type = float, default = 0.1,
+                        help = "empeoramiento máximo permitido respecto a la referencia (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    from manim import __version__ as manim_version
+    meta = dict(date = time.strftime("%Y-%m-%dT%H:%M:%S"), python = sys.version.split()[0],
+                manim = manim_version, platform = platform.platform(), cpus = os.cpu_count())
+    if args.cloud:
+        with open(args.output, "w") as f:
+            json.dump(dict(meta = meta, cloud = run_cloud(args.quality, args.media_dir)), f, indent = 2)
+        return 0
+
+    results = run(args.quality, args.angle, args.media_dir, args.workers)
+    report = dict(meta = meta, results = results)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent = 2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for reg in regressions:
+            print("REGRESIÓN {quality} {angle} {phase} {metric}: {baseline:.4g} -> {value:.4g} ({change:+.1%})".format(**reg))
+        if regressions:
+            return 1
+        print("Sin regresiones respecto a", args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
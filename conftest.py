@@ -0,0 +1 @@
+# Hace que los tests (en tests/) puedan importar los módulos de la raíz del repositorio
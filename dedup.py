@@ -0,0 +1,123 @@
+# Reutilización de fotogramas que no cambian y de la capa de fondo estática
+from manim import *
+import hashlib
+
+def _members(mobjects):
+    # Miembros con puntos de las familias de mobjects, en el orden en que se dibujan
+    res = []
+    seen = set()
+    for mob in mobjects:
+        for member in mob.family_members_with_points():
+            if id(member) not in seen:
+                seen.add(id(member))
+                res.append(member)
+    return res
+
+def _state_hash(members):
+    # Huella de todo lo que influye en cómo se dibujan los objetos (puntos, colores, grosores...)
+    h = hashlib.blake2b(digest_size = 16)
+    for mob in members:
+        h.update(id(mob).to_bytes(8, "little"))
+        for name in ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array"):
+            arr = getattr(mob, name, None)
+            if arr is not None:
+                h.update(np.ascontiguousarray(arr).data)
+        h.update(repr((
+            getattr(mob, "stroke_width", None), getattr(mob, "background_stroke_width", None),
+            getattr(mob, "sheen_factor", None), getattr(mob, "z_index", 0),
+        )).encode())
+    return h.digest()
+
+class DedupScene(Scene):
+    """
+        Escena que evita volver a dibujar lo que no ha cambiado:
+            - Antes de dibujar un fotograma calcula una huella de los objetos que se mueven. Si coincide
+              con la del fotograma anterior (y el fondo estático es el mismo), ese fotograma ya está
+              dibujado y se escribe otra vez sin rasterizar nada (como mucho se copia, si la cámara
+              está dibujando en otro array).
+            - Los objetos de background_mobjects (por ejemplo, el plano y el círculo) se dibujan una
+              sola vez en una capa que se guarda entre animaciones; al preparar el fondo estático de
+              cada animación sólo se dibujan encima el resto de objetos estáticos. La capa sólo se usa
+              con los objetos de fondo que se dibujan antes que todos los demás, para no cambiar el
+              orden de dibujo, y se vuelve a generar si alguno de ellos cambia.
+
+        Atributos
+        ------------
+            background_mobjects : lista de objetos que forman la capa de fondo.
+            dedup_stats : fotogramas dibujados, fotogramas reutilizados y veces que se ha dibujado la capa.
+    """
+    background_mobjects = ()
+
+    def setup(self):
+        super().setup()
+        self.dedup_stats = dict(rasterized = 0, reused = 0, background_layers = 0)
+        # Cambia cada vez que cambia el fondo estático de la animación
+        self._static_version = 0
+        self._last_frame_key = None
+        # Array en el que se dibujó ese fotograma (StreamingEncoderScene cambia el array de la cámara)
+        self._last_frame = None
+        self._layer_key = None
+        self._layer = None
+
+        renderer = self.renderer
+        self._update_frame = renderer.update_frame
+        renderer.update_frame = self._dedup_update_frame
+        renderer.save_static_frame_data = self._save_static_frame_data
+
+    def _dedup_update_frame(self, scene, mobjects = None, include_submobjects = True, ignore_skipping = True, **kwargs):
+        if self.renderer.skip_animations and not ignore_skipping:
+            return
+        if not mobjects or kwargs:
+            # Se dibuja toda la escena (o con opciones especiales): no comparamos con nada
+            self._last_frame_key = None
+            return self._update_frame(scene, mobjects, include_submobjects, ignore_skipping, **kwargs)
+        key = (self._static_version, include_submobjects, _state_hash(_members(mobjects)))
+        camera = self.renderer.camera
+        if key == self._last_frame_key:
+            # El fotograma ya está dibujado; si la cámara está usando otro array, se copia
+            if camera.pixel_array is not self._last_frame:
+                np.copyto(camera.pixel_array, self._last_frame)
+            self.dedup_stats["reused"] += 1
+            return
+        self._update_frame(scene, mobjects, include_submobjects, ignore_skipping)
+        self._last_frame_key = key
+        self._last_frame = camera.pixel_array
+        self.dedup_stats["rasterized"] += 1
+
+    def _save_static_frame_data(self, scene, static_mobjects):
+        # Igual que CairoRenderer.save_static_frame_data, pero empezando por la capa de fondo
+        renderer = self.renderer
+        self._static_version += 1
+        self._last_frame_key = None
+        renderer.static_image = None
+        if not static_mobjects:
+            return None
+
+        background = set(map(id, _members(self.background_mobjects)))
+        num_background = 0
+        while num_background < len(static_mobjects) and id(static_mobjects[num_background]) in background:
+            num_background += 1
+        if num_background == 0 or any(getattr(mob, "z_index", 0) for mob in static_mobjects):
+            self._update_frame(scene, mobjects = static_mobjects)
+            renderer.static_image = renderer.get_frame()
+            return renderer.static_image
+
+        layer_key = _state_hash(static_mobjects[:num_background])
+        if layer_key != self._layer_key:
+            self._update_frame(scene, mobjects = static_mobjects[:num_background])
+            self._layer = renderer.get_frame()
+            self._layer_key = layer_key
+            self.dedup_stats["background_layers"] += 1
+        renderer.static_image = self._layer
+        if num_background < len(static_mobjects):
+            # Dibujamos el resto de objetos estáticos encima de la capa
+            self._update_frame(scene, mobjects = static_mobjects[num_background:])
+            renderer.static_image = renderer.get_frame()
+        return renderer.static_image
+
+    def tear_down(self):
+        super().tear_down()
+        logger.info(
+            "Fotogramas: %d dibujados, %d reutilizados; capa de fondo dibujada %d veces",
+            self.dedup_stats["rasterized"], self.dedup_stats["reused"], self.dedup_stats["background_layers"]
+        )
@@ -0,0 +1,94 @@
+# Caché en disco compartida entre procesos con expulsión LRU
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
+
+class DiskLRU:
+    """
+        Caché clave -> bytes guardada en un directorio, con un fichero por entrada. Se puede usar desde
+        varios procesos a la vez: las escrituras son atómicas (fichero temporal + os.replace) y la
+        expulsión se hace con un cerrojo (flock) sobre el directorio. La fecha de modificación de cada
+        fichero hace de marca de último uso, así que cuando el tamaño total supera max_bytes se borran
+        las entradas usadas hace más tiempo.
+
+        Parámetros
+        ----------------
+            directory : directorio donde se guardan las entradas (se crea si no existe).
+            max_bytes : tamaño máximo total de las entradas.
+            suffix : extensión de los ficheros de las entradas.
+
+        Métodos
+        ------------
+            get : devuelve los bytes de una clave (o None) y la marca como usada.
+            put : guarda los bytes de una clave y expulsa entradas si hace falta.
+    """
+
+    def __init__(self, directory, max_bytes, suffix = ".bin"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        os.makedirs(directory, exist_ok = True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            # Marcamos la entrada como usada recientemente
+            os.utime(path)
+        except FileNotFoundError:
+            # Otro proceso la ha expulsado mientras la leíamos; los datos siguen siendo válidos
+            pass
+        return data
+
+    def put(self, key, data):
+        fd, tmp = tempfile.mkstemp(dir = self.directory, suffix = ".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self._evict()
+
+    @contextmanager
+    def _lock(self):
+        with open(os.path.join(self.directory, ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _evict(self):
+        with self._lock():
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+            # Borramos primero las entradas usadas hace más tiempo
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
@@ -0,0 +1,77 @@
+# Caché de MathTex/Text para no volver a compilar LaTeX ni leer SVG en cada render
+from manim import MathTex, Text, config, logger
+import manim
+import hashlib
+import os
+import pickle
+
+from disk_cache import DiskLRU
+
+# Tamaño máximo de la caché en disco (en MB), configurable con la variable de entorno
+MAX_MB = int(os.environ.get("PRUEBA_GLYPH_CACHE_MB", 64))
+
+# Memo en memoria: clave -> objeto ya construido (con sus puntos) que sólo se copia
+_memo = {}
+# Cachés en disco por directorio (config.media_dir puede cambiar entre renders)
+_disks = {}
+
+def _disk():
+    directory = os.environ.get("PRUEBA_GLYPH_CACHE") or os.path.join(config.media_dir, "glyphs")
+    if directory not in _disks:
+        try:
+            _disks[directory] = DiskLRU(directory, MAX_MB * 1024 * 1024, suffix = ".pkl")
+        except OSError as e:
+            # Directorio que no se puede crear (sólo lectura, disco lleno...): sólo caché en memoria
+            logger.warning("No se puede usar la caché de glifos en %s: %s", directory, e)
+            _disks[directory] = None
+    return _disks[directory]
+
+def _key(mob_class, text, kwargs):
+    # La plantilla de LaTeX forma parte de la clave: el mismo texto con otra plantilla es otro glifo
+    template = kwargs.get("tex_template", config.tex_template)
+    style = sorted((k, repr(v)) for k, v in kwargs.items() if k != "tex_template")
+    raw = repr((manim.__version__, mob_class.__name__, text, getattr(template, "body", repr(template)), style))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+def cached_mobject(mob_class, text, **kwargs):
+    """
+        Devuelve una copia de mob_class(text, **kwargs). El objeto original se busca primero en memoria,
+        después en la caché en disco y sólo si no está en ninguna se construye (compilando LaTeX o
+        leyendo la fuente). Si no se puede leer o escribir en la caché en disco (por ejemplo, un
+        media_dir de sólo lectura o un disco lleno) se sigue sólo con la caché en memoria.
+    """
+    key = _key(mob_class, text, kwargs)
+    proto = _memo.get(key)
+    if proto is None:
+        disk = _disk()
+        data = None
+        if disk is not None:
+            try:
+                data = disk.get(key)
+            except OSError as e:
+                logger.warning("No se puede leer la caché de glifos: %s", e)
+        if data is not None:
+            try:
+                proto = pickle.loads(data)
+            except Exception:
+                # Entrada corrupta o de otra versión: la volvemos a generar
+                proto = None
+        if proto is None:
+            proto = mob_class(text, **kwargs)
+            if disk is not None:
+                try:
+                    disk.put(key, pickle.dumps(proto, protocol = pickle.HIGHEST_PROTOCOL))
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    # Si el objeto no se puede serializar nos quedamos sólo con la caché en memoria
+                    pass
+                except OSError as e:
+                    # Caché de sólo lectura o disco lleno: el glifo se queda en memoria
+                    logger.warning("No se puede guardar el glifo en la caché: %s", e)
+        _memo[key] = proto
+    return proto.copy()
+
+def cached_tex(tex, **kwargs):
+    return cached_mobject(MathTex, tex, **kwargs)
+
+def cached_text(text, **kwargs):
+    return cached_mobject(Text, text, **kwargs)
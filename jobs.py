@@ -0,0 +1,114 @@
+# Render de una variante de Prueba a partir de un trabajo (diccionario con sus parámetros)
+import re
+import shutil
+import time
+
+# Resolución y fotogramas por segundo de cada calidad (los de manim.constants.QUALITIES, que no se
+# importa aquí para no cargar Manim), y la calidad que usa Manim si no se indica ninguna
+QUALITIES = {
+    "fourk_quality": (3840, 2160, 60),
+    "production_quality": (2560, 1440, 60),
+    "high_quality": (1920, 1080, 60),
+    "medium_quality": (1280, 720, 30),
+    "low_quality": (854, 480, 15),
+    "example_quality": (854, 480, 30),
+}
+DEFAULT_QUALITY = "high_quality"
+
+def parse_resolution(resolution):
+    """
+        Convierte "1280x720" (o [1280, 720]) en (1280, 720)
+    """
+    if isinstance(resolution, str):
+        resolution = resolution.lower().split("x")
+    width, height = resolution
+    return int(width), int(height)
+
+def job_size(job):
+    """
+        Anchura, altura y fotogramas por segundo con los que se renderiza un trabajo: los de su
+        calidad, salvo la resolución si la indica
+    """
+    width, height, fps = QUALITIES.get(job.get("quality") or DEFAULT_QUALITY, QUALITIES[DEFAULT_QUALITY])
+    if job.get("resolution"):
+        width, height = parse_resolution(job["resolution"])
+    return width, height, fps
+
+def job_id(job):
+    """
+        Identificador de un trabajo: el nombre del vídeo si lo tiene y, si no, sus parámetros
+        (por ejemplo, giro_45_1_0 o giro_45_1_0_1280x720)
+    """
+    if job.get("output"):
+        return str(job["output"])
+    x, y = job.get("vector", (1, 0))
+    name = "giro_{:g}_{:g}_{:g}".format(float(job["angle"]), float(x), float(y))
+    if job.get("resolution"):
+        name += "_{}x{}".format(*parse_resolution(job["resolution"]))
+    return name
+
+def scene_class(angle, vector, name = "Prueba"):
+    """
+        Subclase de Prueba con el ángulo y el vector inicial indicados. Manim usa el nombre de la
+        clase para el directorio de los vídeos parciales, así que cada trabajo que se renderiza a la
+        vez que otros necesita un nombre distinto.
+    """
+    from main import Prueba
+    return type(name, (Prueba,), { "angulo": angle, "pos_inicial": tuple(vector) })
+
+def render_prueba(job):
+    """
+        Renderiza una variante de Prueba y devuelve un diccionario con el resultado.
+
+        Cada trabajo tiene su propia escena (Prueba_<id>) y, por tanto, su propio directorio de vídeos
+        parciales, que se borra al acabar; lo que se puede reutilizar entre trabajos está en las
+        cachés de glifos y de secciones, que se comparten.
+
+        Parámetros
+        ----------------
+            job : diccionario con los campos
+                    angle : ángulo en grados.
+                    vector : vector inicial, por ejemplo [1, 0].
+                    quality : calidad de Manim (low_quality, high_quality...). Opcional.
+                    resolution : resolución, por ejemplo "1280x720". Opcional.
+                    output : nombre o ruta del vídeo. Opcional (por defecto, el id).
+                    id : identificador del trabajo. Opcional (por defecto, job_id).
+                    media_dir : directorio de Manim. Opcional.
+
+        Devuelve un diccionario con status ("ok"), output (ruta del vídeo) y seconds (tiempo de render).
+    """
+    from manim import tempconfig
+
+    name = str(job.get("id") or job_id(job))
+    overrides = { "output_file": str(job.get("output") or name) }
+    if job.get("quality"):
+        overrides["quality"] = job["quality"]
+    if job.get("resolution"):
+        overrides["pixel_width"], overrides["pixel_height"] = parse_resolution(job["resolution"])
+    if job.get("media_dir"):
+        overrides["media_dir"] = job["media_dir"]
+
+    start = time.perf_counter()
+    with tempconfig(overrides):
+        cls = scene_class(job["angle"], job.get("vector", (1, 0)), "Prueba_" + re.sub(r"\W", "_", name))
+        scene = cls()
+        scene.render()
+        writer = scene.renderer.file_writer
+        output = getattr(writer, "movie_file_path", None)
+        partials = getattr(writer, "partial_movie_directory", None)
+    if partials:
+        shutil.rmtree(partials, ignore_errors = True)
+    return dict(status = "ok", output = str(output), seconds = time.perf_counter() - start)
+
+def run_job(job):
+    """
+        Como render_prueba, pero los errores se devuelven (status "error") en lugar de lanzarse, para
+        usarla en los procesos de un pool. El resultado lleva el id del trabajo si lo tiene.
+    """
+    try:
+        result = render_prueba(job)
+    except Exception as e:
+        result = dict(status = "error", error = "{}: {}".format(type(e).__name__, e))
+    if "id" in job:
+        result["id"] = job["id"]
+    return result
@@ -2,6 +2,28 @@
 from manim import *
 # Importamos NumPy
 import numpy as np
+# Caché de fórmulas y textos (evita compilar LaTeX en cada render)
+from glyph_cache import cached_tex, cached_text
+# Rotaciones vectorizadas (matrices y puntos rotados)
+from rotation import rotation_matrices, rotate_points, embed_rotation
+# Números que reutilizan sus glifos al animar el valor
+from atlas_decimal import AtlasDecimalNumber
+# Escena que quita los objetos invisibles o sustituidos
+from reclaim import ReclaimingScene
+# Escena que guarda una traza de cada animación (si se define PRUEBA_TRACE)
+from tracing import TracingScene
+# Escena que reparte los fotogramas de una animación entre varios procesos
+from parallel import ParallelScene
+# Escena que escribe el vídeo en un hilo aparte
+from streaming import StreamingEncoderScene
+# Escena que no vuelve a dibujar los fotogramas que no cambian ni el fondo estático
+from dedup import DedupScene
+# Escena cuyas partes se guardan en caché como secciones
+from sections import SectionCacheScene
+# Animación del producto matriz x vector para cualquier tamaño
+from matmul import MatrixVectorProduct
+# Nube de flechas para rotar miles de vectores a la vez
+from point_cloud import ArrowCloud, ArrowCloudScene, RotateCloud
 
 # https://pastebin.com/bTSF02RC
 # Type of animations
@@ -13,96 +35,163 @@ import numpy as np
 # Exec args
 # https://infograph.tistory.com/122
 
+class AngleSlot(VGroup):
+    """
+        Hueco para el ángulo de una entrada de RotationMatrix. Se crea una sola vez con la letra (alfa,
+        beta...) y el número que la sustituirá, de modo que cambiar el ángulo nunca crea objetos nuevos.
+        
+        Parámetros
+        ----------------
+            angle : ángulo inicial (número) o letra en formato LaTeX.
+            is_number : booleano que indica si angle es un número o una letra.
+            num_decimal : int que indica el número de decimales del ángulo.
+    """
+    
+    def __init__(self, angle, is_number = True, num_decimal = 0, **kwargs):
+        VGroup.__init__(self, **kwargs)
+        if is_number:
+            self.label = None
+            self.number = AtlasDecimalNumber(angle, num_decimal)
+            self.add(self.number)
+        else:
+            self.label = cached_tex(angle)
+            # El número empieza oculto encima de la letra
+            self.number = AtlasDecimalNumber(0, num_decimal).move_to(self.label.get_center()).scale(0.8)
+            self.number.set_opacity(0)
+            self.add(self.label, self.number)
+        # Indica si se está mostrando la letra en lugar del número
+        self.showing_label = not is_number
+
+def trig_layout(n):
+    """
+        Texto de cada entrada de una matriz de rotación n x n que gira en el plano de los dos primeros
+        ejes: senos y cosenos arriba a la izquierda y la identidad en el resto.
+    """
+    layout = [ [ "1" if i == j else "0" for j in range(n) ] for i in range(n) ]
+    layout[0][0], layout[0][1] = r"\cos", r"-\sin"
+    layout[1][0], layout[1][1] = r"\sin", r"\cos"
+    return layout
+
+def decimal_places(values, decimals = 2):
+    """
+        Decimales con los que mostrar unos valores: 0 si todos son enteros (como con 90º) y decimals
+        si alguno no lo es (como con 45º).
+    """
+    values = np.asarray(values, dtype = float)
+    return 0 if np.allclose(values, np.rint(values), rtol = 0, atol = 1e-9) else decimals
+
+def set_hidden_values(numbers, values):
+    """
+        Cambia el valor de unos DecimalNumber ocultos sin que se vean. set_value sólo copia el estilo
+        (y la opacidad) a los caracteres que ya había, así que los nuevos (el signo, los decimales...)
+        aparecerían con opacidad 1; por eso se vuelven a ocultar.
+    """
+    places = decimal_places(values)
+    for number, value in zip(numbers, values):
+        number.num_decimal_places = places
+        number.set_value(value)
+        number.set_opacity(0)
+
 class RotationMatrix(Matrix):
     """
-        Clase para implementar una matriz de rotación 2x2 con los senos y cosenos. Permite
-        animar el cambio de ángulo y establecer el número de decimales de dicho ángulo.
+        Clase para implementar una matriz de rotación n x n (2x2 por defecto) con los senos y cosenos.
+        Permite animar el cambio de ángulo y establecer el número de decimales de dicho ángulo.
+        
+        Cada entrada es un grupo (sin o cos + AngleSlot) que se crea una única vez; los cambios de
+        ángulo se animan sobre esos mismos objetos. Las entradas sin ángulo (None) son constantes
+        (0 o 1, según trig_layout).
         
         Parámetros
         ----------------
-            matrix : lista de listas que contienen los ángulos de cada entrada de la matriz de rotación.
+            matrix : lista de listas que contienen los ángulos de cada entrada de la matriz de rotación
+                          (None en las entradas constantes). RotationMatrix.of crea esta lista.
             is_number : booleano que indica si las entradas son ángulos o letras (como alfa, beta...). Las
                                   letras estarán dadas en formato LaTeX.
             num_decimal : int que indica el número de decimales que incluir en los ángulos.
             
+        Atributos
+        ------------
+            slots : lista con el AngleSlot de cada entrada (por filas).
+            angles : lista con el número de cada entrada (por filas).
+            labels : lista con la letra de cada entrada (por filas), o None si is_number es True.
+            
         Métodos
         ------------
+            of : crea la matriz de rotación n x n con el mismo ángulo en todas las entradas.
             sin_cosine : método auxiliar para crear la matriz de rotación que sustituye la función que se 
                                  utiliza en el código fuente de la clase Matrix de Manim.
-            update_mob : este método debe ejecutarse después del método change_matrix_values para
-                                     guardar los cambios realizados por este.
-            change_matrix_values : permite cambiar las letras (alfa, beta...) por números
+            change_matrix_values : devuelve las animaciones que cambian el ángulo de todas las entradas
+                                                (la primera vez sustituye las letras por números).
     """
-        
     def __init__(self, matrix, is_number = True, num_decimal = 0,**kwargs):
         self.num_decimal = num_decimal
         self.is_number = is_number
-        # Variable auxiliar para el método sin_cosine. 
-        # Permite conocer en qué entrada de la matriz nos encontramos
-        self.ind = 0
-        # Lista que guarda los objetos que contienen los ángulos de cada entrada
-        self.angles = []
+        # Ángulos de cada entrada, por filas
+        self.entries = [ angle for row in matrix for angle in row ]
+        self.cols = len(matrix[0])
+        # Función trigonométrica (o constante) de cada entrada (fila, columna)
+        self.trig = trig_layout(self.cols)
+        # A Matrix le pasamos el índice de cada entrada en lugar del ángulo, así sin_cosine sabe qué
+        # entrada está creando sin tener que contar las llamadas
+        indices = [ [ i*self.cols + j for j in range(self.cols) ] for i in range(len(matrix)) ]
         
         # Iniciamos la clase Matrix de Manim
-        Matrix.__init__(self, matrix, element_to_mobject = self.sin_cosine, h_buff = 2.5, **kwargs)    
+        Matrix.__init__(self, indices, element_to_mobject = self.sin_cosine, h_buff = 2.5, **kwargs)    
+        
+        # Guardamos los huecos de los ángulos tal y como han quedado en la matriz
+        self.slots = [ entry[1] for row in self.mob_matrix for entry in row if len(entry) > 1 ]
+        self.angles = [ slot.number for slot in self.slots ]
+        self.labels = [ slot.label for slot in self.slots ]
+    
+    @classmethod
+    def of(cls, angle, n = 2, **kwargs):
+        matrix = [ [ angle if i < 2 and j < 2 else None for j in range(n) ] for i in range(n) ]
+        return cls(matrix, **kwargs)
     
-    def sin_cosine(self, angle):
+    def sin_cosine(self, index):
+        i, j = divmod(int(index), self.cols)
         # Texto de la entrada actual (sin o cos)
-        text1 = None
-        if self.ind in [1, 4]:
-            # Si nos encontramos en las posiciones 1 o 4 poner cos
-            text1 =  MathTex(r"\cos")
-        elif self.ind == 2:
-            # Si nos encontramos en la posición 2 poner -sin
-            text1 =  MathTex(r"-\sin")
-        else:
-            # Si nos encontramos en la posición 3 poner sin
-            text1 =  MathTex(r"\sin")
-        
+        text1 = cached_tex(self.trig[i][j])
+        if self.entries[index] is None:
+            # Entrada constante (0 o 1)
+            return VGroup(text1)
         # Parámetro del sin o cos de la entrada actual
-        text2 = None
-        if self.is_number:
-            text2 = DecimalNumber(angle, num_decimal)
-        else:
-            text2 = MathTex(angle)
-        
+        text2 = AngleSlot(self.entries[index], self.is_number, self.num_decimal)
         # Ponemos text2 a la derecha de text1
         text2.next_to(text1, direction = RIGHT)
-        # Incluimos el objeto text2 en la lista self.angles
-        self.angles.append(text2)
-        # Pasamos a la siguiente posición
-        self.ind += 1
         
         # Devolvemos un grupo formado por text1 y text2
         return VGroup(text1, text2)
     
-    def update_mob(self):
-        counter = 1
-        # Para cada entrada de la matriz...
-        for i in range(2):
-            for j in range(2):
-                # Eliminamos el valor anterior del ángulo en la posición (i, j) de la matriz
-                self.mob_matrix[i][j] -= self.mob_matrix[i][j][1]
-                # Añadimos el nuevo valor (self.mob_matrix[i][j] es un VGroup formado por
-                # sin o cos + ángulo
-                self.mob_matrix[i][j] += self.angles[counter]
-                counter += 1
-    
     def change_matrix_values(self, val):
-        # Por algún motivo extraño self.angles tiene un elemento de más siempre
-        # Por eso añadimos un elemento None al principio de angles_aux
-        angles_aux = [None] + \
-            [ DecimalNumber(val, self.num_decimal).move_to(angle.get_center()).scale(0.8) for angle in self.angles[1:] ]
-        # Lista que contiene las animaciones para transformar los ángulos antiguos (alfas, betas...) por números nuevos,
-        # dados por el parámetro val
-        res = [ ReplacementTransform(self.angles[i], angles_aux[i]) for i in range(1, len(self.angles)) ]
-        # Reemplazamos la variable self.angles por los nuevos objetos de ángulo
-        self.angles = angles_aux
+        # Lista que contiene las animaciones para cambiar el ángulo de cada entrada al valor val
+        res = []
+        for slot in self.slots:
+            if slot.showing_label:
+                # Ponemos el valor en el número (oculto) y cambiamos la letra por el número
+                slot.number.set_value(val).move_to(slot.label.get_center())
+                res += [ slot.label.animate.set_opacity(0), slot.number.animate.set_opacity(1) ]
+                slot.showing_label = False
+            else:
+                res.append(ChangeDecimalToValue(slot.number, val))
         
         # Devolvemos las animaciones (sin reproducir)
         return res
         
-class Prueba(Scene):
+class NextTo:
+    """
+        Updater que mantiene un objeto junto a otro (obj.next_to(target, direction)). A diferencia de
+        una lambda se puede copiar y serializar junto con la escena.
+    """
+    
+    def __init__(self, target, direction = UP):
+        self.target = target
+        self.direction = direction
+        
+    def __call__(self, obj):
+        obj.next_to(self.target, direction = self.direction)
+        
+class Prueba(TracingScene, ReclaimingScene, ParallelScene, StreamingEncoderScene, DedupScene, SectionCacheScene):
     """
         Aquí están todas las animaciones. Orden:
             1. create_plane : se crea el plano, con el círculo y el vector con sus coordenadas
@@ -110,43 +199,77 @@ class Prueba(Scene):
             3. create_angle : creamos el ángulo alfa arriba a la izquierda y sustituye alfa por 0 en la
                 matriz
             4. rotate_vector : enseña la multiplicación de matrices y rota el vector
+            
+        Es una ReclaimingScene: los objetos que se ocultan con set_opacity(0) o que se transforman en otro
+        que ya está en pantalla se quitan de la escena solos. También es una TracingScene: con
+        PRUEBA_TRACE=traza.json se guarda una traza con el coste de cada self.play. Las animaciones más
+        largas se renderizan en paralelo si se define PRUEBA_WORKERS (ParallelScene) y el vídeo se
+        escribe en un hilo aparte mientras se dibujan los fotogramas (StreamingEncoderScene). Los
+        fotogramas que no cambian y el fondo (plano + círculo) no se vuelven a dibujar (DedupScene).
+        
+        Los pasos 1-3 forman el prefijo (construct_prefix), que no depende del ángulo, y el paso 4
+        la cola (construct_tail). batch.py aprovecha esta división para renderizar muchas variantes.
+        
+        Cada paso es una sección (SectionCacheScene): si no se ha cambiado su código ni el de los pasos
+        anteriores, se recupera de la caché en lugar de volver a renderizarse.
     """
+    # Posición inicial del vector y ángulo que se rota. Se pueden cambiar en una subclase
+    # (o desde batch.py) para renderizar otras variantes sin tocar el código
+    pos_inicial = (1, 0)
+    angulo = 90
+    
+    # Atributos que guardan el estado de la escena entre pasos
+    state_attributes = ("plane", "circle", "background_mobjects", "pos", "vector", "x_val", "y_val", "pos_text",
+                        "mat_rot", "vec_orig", "equals", "vec_rot", "matriz_juntas", "label_group", "pos_copy",
+                        "angle", "angle_group")
+    # Clases cuyo código afecta a todos los pasos
+    section_dependencies = (trig_layout, decimal_places, set_hidden_values, AngleSlot, RotationMatrix, NextTo, MatrixVectorProduct)
+    
     def construct(self):
-        self.angle = DecimalNumber(0, num_decimal_places = 0)
-        self.create_plane()
-        self.create_matrix()
-        # Enlazamos el vector y sus coordenadas, de manera que la posición del vector afecte
-        # a la posición del texto
-        self.pos_text.add_updater(lambda obj : obj.next_to(self.vector, direction = UP))
-        self.create_angle()
-        self.rotate_vector(90)
+        self.construct_prefix()
+        self.construct_tail(self.angulo)
+        
+    def section_params(self):
+        return (tuple(self.pos_inicial),)
+        
+    def construct_prefix(self):
+        # Parte del vídeo que no depende del ángulo (sólo de la posición inicial del vector)
+        self.angle = AtlasDecimalNumber(0, num_decimal_places = 0)
+        self.run_section("create_plane")
+        self.run_section("create_matrix")
+        self.run_section("create_angle")
+        
+    def construct_tail(self, angle):
+        # Parte del vídeo que depende del ángulo
+        self.run_section("rotate_vector", angle, depends_on = ("show_mul",))
         # Esperamos 2 segundos al terminar las animaciones antes de acabar el vídeo
         self.wait(2)
         
     def create_plane(self):
         # Creamos el plano y lo dibujamos
-        plane = self.play(ShowCreation(NumberPlane()))
+        self.plane = NumberPlane()
+        self.play(Create(self.plane))
         # Posición inicial del vector
-        self.pos = np.array([1, 0])
+        self.pos = np.array(self.pos_inicial)
         # Creamos el vector en esa posición
         self.vector = Vector(self.pos)
         # Creamos el círculo discontinuo
-        circle = DashedVMobject(Circle(color = BLUE))
+        self.circle = DashedVMobject(Circle(color = BLUE))
         
         # Creamos el número que representa la posición X del vector
-        self.x_val = DecimalNumber(self.pos[0])
+        self.x_val = AtlasDecimalNumber(self.pos[0])
         # Creamos el número que representa la posición Y del vector
-        self.y_val = DecimalNumber(self.pos[1])
+        self.y_val = AtlasDecimalNumber(self.pos[1])
         # Creamos el paréntesis izquierdo de las coordenadas
-        vec_text1 = Text("(")
+        vec_text1 = cached_text("(")
         # Ponemos x_val a la derecha del paréntesis anterior
         self.x_val.next_to(vec_text1, direction = RIGHT*.5)
         # Creamos la coma que separa las coordenadas y lo ponemos abajo a la derecha de x_val
-        vec_text2 = MathTex(",").next_to(self.x_val, direction = DOWN*.1 + RIGHT*.3)
+        vec_text2 = cached_tex(",").next_to(self.x_val, direction = DOWN*.1 + RIGHT*.3)
         # Ponemos y_val a la derecha de la coma
         self.y_val.next_to(vec_text2, direction = UP*.1 + RIGHT*.5)
         # Creamos el paréntesis derecho de las coordenadas y lo ponemos a la derecha de y_val
-        vec_text3 = Text(")").next_to(self.y_val, direction = RIGHT*.5)
+        vec_text3 = cached_text(")").next_to(self.y_val, direction = RIGHT*.5)
         
         # Creamos un grupo con las todas las componentes de las coordenadas (números + ( + ) + ,)
         # y lo hacemos más pequeño (con scale)
@@ -160,17 +283,24 @@ class Prueba(Scene):
         # Dibujamos las coordenadas
         self.play(Write(self.pos_text))
         # Dibujamos el círculo en 2 segundos
-        self.play(ShowCreation(circle, run_time = 2))
+        self.play(Create(self.circle, run_time = 2))
+        # Dejamos el plano y el círculo debajo de todo: así forman la capa de fondo que DedupScene
+        # dibuja una sola vez
+        self.bring_to_back(self.circle)
+        self.bring_to_back(self.plane)
+        self.background_mobjects = [self.plane, self.circle]
         
     def create_matrix(self):
         # Creamos la matriz de rotación con \alpha como valor de ángulo
-        self.mat_rot = RotationMatrix([[r"\alpha", r"\alpha"], [r"\alpha", r"\alpha"]], is_number = False)
-        # Creamos la matriz columna que indica el vector inicial
-        self.vec_orig = IntegerMatrix([[self.pos[0]], [self.pos[1]]])
+        self.mat_rot = RotationMatrix.of(r"\alpha", is_number = False)
+        # Creamos la matriz columna que indica el vector inicial (con decimales si no es entero)
+        self.vec_orig = DecimalMatrix([[self.pos[0]], [self.pos[1]]],
+                                      element_to_mobject_config = { "num_decimal_places": decimal_places(self.pos) })
         # Creamos el =
-        self.equals = MathTex(r"=")
-        # Creamos la matriz columna que indica el vector rotado (el producto de las matrices anteriores)
-        self.vec_rot = IntegerMatrix([[0], [1]])
+        self.equals = cached_tex(r"=")
+        # Creamos la matriz columna que indica el vector rotado (el producto de las matrices anteriores).
+        # Sus valores y decimales dependen del ángulo, así que se ponen en rotate_vector
+        self.vec_rot = DecimalMatrix([[0], [1]], element_to_mobject_config = { "num_decimal_places": 0 })
         
         # Ponemos el vector inicial a la derecha de la matriz de rotación
         self.vec_orig.next_to(self.mat_rot, direction = RIGHT)
@@ -192,38 +322,43 @@ class Prueba(Scene):
         # Lo movemos a la esquina superior derecha
         self.label_group.to_corner(UP+RIGHT)
          
-         # Animamos la creación de las matrices y su fondo
-        self.play(Write(self.label_group, run_time = 3))
+         # Animamos la creación de las matrices y su fondo (repartiendo los fotogramas entre procesos)
+        with self.parallel_frames():
+            self.play(Write(self.label_group, run_time = 3))
         # Mostramos las coordenadas de la matriz columna que representa el vector original
         self.vec_orig.elements.set_opacity(1)
         # Copiamos las coordenadas del vector que está encima de la flecha
         self.pos_copy = self.pos_text.copy()
         # Movemos la copia a donde está la matriz columna mientras animamos el cambio de opacidad (FadeIn)
         self.play(Transform(self.pos_copy, self.vec_orig), FadeIn(self.vec_orig.elements))
-        # Ocultamos la copia (no sé cómo se borran elementos, jeje)
+        # Ocultamos la copia (ReclaimingScene la quita de la escena antes de la siguiente animación)
         self.pos_copy.set_opacity(0)
         
+        # Enlazamos el vector y sus coordenadas, de manera que la posición del vector afecte
+        # a la posición del texto
+        self.pos_text.add_updater(NextTo(self.vector, direction = UP))
+        
     def create_angle(self):
         # Creamos el \alpha que se pone en el recuadro superior izquierdo
-        angle_text = MathTex(r"\alpha")
+        angle_text = cached_tex(r"\alpha")
         # Creamos el =
-        angle_eq = MathTex(r"=").next_to(angle_text, direction = RIGHT)
+        angle_eq = cached_tex(r"=").next_to(angle_text, direction = RIGHT)
         # Creamos el número que los acompaña con 0 decimales
-        self.angle = DecimalNumber(0, num_decimal_places = 0).next_to(angle_eq, direction = RIGHT)
+        self.angle = AtlasDecimalNumber(0, num_decimal_places = 0).next_to(angle_eq, direction = RIGHT)
         # Juntamos los 3 elementos anteriores
         self.angle_group = VGroup(angle_text, angle_eq, self.angle)
-        # Creamos el fondo del grupo anterior. Esta vez le ponemos un margen (buff) de 0.45, para que no se salga 
-        # el valor de \alpha al cambiar de 1 dígito (0) a 2 dígitos (90)
-        bg = SurroundingRectangle(self.angle_group, color=BLUE, buff = 0.45, fill_color=BLACK, fill_opacity=1)
+        # Creamos el fondo del grupo anterior. El prefijo es el mismo para todos los ángulos, así que el
+        # fondo se ajusta al valor más ancho que puede tomar \alpha (signo y 3 dígitos), que no se añade
+        # a la escena: el número crece hacia la derecha desde su borde izquierdo
+        widest = AtlasDecimalNumber(-360, num_decimal_places = 0).move_to(self.angle, aligned_edge = LEFT)
+        bg = SurroundingRectangle(VGroup(angle_text, angle_eq, widest), color=BLUE, buff = 0.3, fill_color=BLACK, fill_opacity=1)
         # Juntamos el fondo y angle_group
         self.angle_group = VGroup(bg, self.angle_group)
         # Llevamos todo a la esquina superior izquierda
         self.angle_group.to_corner(UP+LEFT)
         
         # Copiamos todos los ángulos de la matriz de rotación para posteriormente animarlos y moverlos a la izquierda
-        # Ponemos range(1, 5) porque hay un bug en la clase de la matriz de rotación en el que se crea un elemento 
-        # adicional (no sé por qué es, pero de momento me suda los cojones)
-        alphas = [ self.mat_rot.angles[i].copy() for i in range(1, 5) ]
+        alphas = [ label.copy() for label in self.mat_rot.labels ]
         # Reproducimos la transición que mueve la copia de los alfas de la matriz de rotación a la izquierda mientras
         # aparece el grupo angle_group
         self.play(*[ Transform(alphas[i], angle_text) for i in range(4) ], FadeIn(self.angle_group, run_time = 3))
@@ -232,26 +367,25 @@ class Prueba(Scene):
         angles_text = [ self.angle.copy() for i in range(4) ]
         # Reproducimos la transición que mueve las copias anteriores a las entradas de la matriz de rotación
         # mientras cambiamos los valores de la matriz de rotación de alfa a 0
+        changes = self.mat_rot.change_matrix_values(0)
         self.play(
-            *[ ReplacementTransform(angles_text[i], self.mat_rot.angles[i + 1]) for i in range(4) ], 
-            *self.mat_rot.change_matrix_values(0)
+            *[ txt.animate.match_height(num).move_to(num.get_center()) for txt, num in zip(angles_text, self.mat_rot.angles) ], 
+            *changes
         )
-        # Actualizamos los valores internos de la matriz de rotación
-        self.mat_rot.update_mob()
         
-        # Ocultamos las copias angles_text (sigo sin saber borrar)
+        # Ocultamos las copias angles_text (ReclaimingScene las quita de la escena)
         for txt in angles_text: txt.set_opacity(0) 
         self.play(*[ FadeOut(txt) for txt in angles_text ])
         
     def rotate_vector(self, angle):
         # Creamos la matriz de rotación, pero esta vez no es una imagen sino que es una matriz 
         # de verdad
-        sin_mat = np.array(
-            [[np.cos(np.deg2rad(angle)), -np.sin(np.deg2rad(angle))], 
-              [np.sin(np.deg2rad(angle)), np.cos(np.deg2rad(angle))]]
-        )
+        sin_mat = rotation_matrices(angle)
         # Multiplicamos el vector original por la matriz de rotación, para saber el resultado
-        result = np.matmul(sin_mat, np.array([[self.pos[0]], [self.pos[1]]]))
+        result = rotate_points(self.pos, angle)
+        # Escribimos el resultado en el vector rotado (sigue oculto hasta show_mul), con decimales si
+        # no es entero
+        set_hidden_values(self.vec_rot.elements, result)
         
         # Animamos el recuadro superior izquierdo, haciéndolo grande y pequeño
         self.play(ScaleInPlace(self.angle_group, 1.2), rate_func = rush_into)
@@ -260,155 +394,150 @@ class Prueba(Scene):
         # Animamos el cambio del ángulo de alpha
         self.play(ChangeDecimalToValue(self.angle, angle))
         # Animamos el cambio del ángulo en la matriz de rotación
-        self.play(*[ ChangeDecimalToValue(self.mat_rot.angles[i], angle) for i in range(1, 5) ])
+        self.play(*self.mat_rot.change_matrix_values(angle))
         # Mostramos la multiplicación de matrices
         self.show_mul(sin_mat)
         
         # Duración de cada una de las siguientes animaciones
         duration = 1
-        self.play(
-            # Rotamos el vector PI/2
-            Rotating(self.vector, radians = PI/2, about_point = ORIGIN, run_time=duration), 
-            # Animamos el cambio de las coordenadas del vector
-            ChangeDecimalToValue(self.x_val, result[0][0], run_time=duration), 
-            ChangeDecimalToValue(self.y_val, result[1][0], run_time=duration)
-        )
+        # Los fotogramas sólo dependen del instante, así que se pueden repartir entre procesos
+        with self.parallel_frames():
+            self.play(
+                # Rotamos el vector el ángulo indicado
+                Rotating(self.vector, radians = np.deg2rad(angle), about_point = ORIGIN, run_time=duration), 
+                # Animamos el cambio de las coordenadas del vector
+                ChangeDecimalToValue(self.x_val, result[0], run_time=duration), 
+                ChangeDecimalToValue(self.y_val, result[1], run_time=duration)
+            )
         
     def show_mul(self, sin_mat):
+        # Tamaño de la matriz de rotación
+        n = len(self.mat_rot.mob_matrix)
+        # Decimales de las entradas (0 si el ángulo es múltiplo de 90º)
+        decimals = decimal_places(sin_mat)
+        
         # Movemos el recuadro superior derecho al centro mientras lo hacemos más grande
         self.play(self.label_group.animate.scale(1.5).move_to(ORIGIN))
 
-        # Cambiamos cada una de las entradas por su valor numérico
-        for i in range(2):
-            for j in range(2):
+        # Cambiamos todas las entradas por su valor numérico a la vez, una detrás de otra
+        changes = []
+        numbers = []
+        for i in range(n):
+            for j in range(n):
                 # Cogemos el elemento (i, j) de la matriz
                 mat_el = self.mat_rot.mob_matrix[i][j]
-                # Creamos el número
-                aux_int = Integer(sin_mat[i][j]).move_to(mat_el.get_center()).scale(1.13)
+                # Creamos el número (no se añade a la escena, sólo es el destino de la transformación)
+                aux_num = DecimalNumber(sin_mat[i][j], num_decimal_places = decimals).move_to(mat_el.get_center()).scale(1.13)
+                numbers.append(aux_num)
                 # Transformamos el elemento (i, j) por su valor numérico
-                self.play(Transform(mat_el, aux_int))
-                # Ocultamos el número
-                aux_int.set_opacity(0)
+                changes.append(Transform(mat_el, aux_num))
+        self.play(LaggedStart(*changes, lag_ratio = 0.5, run_time = 2))
+        
+        # Lo que se desplaza cada columna para compactar la matriz: 1, salvo que los números sean tan
+        # anchos (con decimales) que se acabarían tocando
+        columns = self.mat_rot.mob_matrix[0][1].get_x() - self.mat_rot.mob_matrix[0][0].get_x()
+        step = min(1, max(0, columns - max(num.width for num in numbers) - MED_SMALL_BUFF))
+        # Lo que se desplazan los corchetes y los vectores (1 en la de 2x2 con números enteros)
+        spread = (n - 1)*step
+        # Sitio para las sumas en el vector rotado: al menos el doble de spread, y más si las sumas
+        # son más anchas (con decimales)
+        product = MatrixVectorProduct(self.mat_rot, self.vec_orig, self.vec_rot)
+        room = max(2*spread, product.width - self.vec_rot.elements.width)
         
         # Animamos hacer más ancho el recuadro mientras movemos el corchete del paréntesis a la izquierda
         self.play(
-            self.matriz_juntas.bg.animate.set_width(self.matriz_juntas.bg.width + 2), 
-            self.label_group[1].animate.shift(LEFT)
+            self.matriz_juntas.bg.animate.set_width(self.matriz_juntas.bg.width + room), 
+            self.label_group[1].animate.shift(LEFT*room/2)
         )
         
         # Animamos muchas cosas (todas a la vez)
         self.play(
-            # Movemos la columna derecha de la matriz de rotación hacia la izquierda
-            self.mat_rot.mob_matrix[0][1].animate.shift(LEFT), 
-            self.mat_rot.mob_matrix[1][1].animate.shift(LEFT), 
+            # Movemos cada columna de la matriz de rotación hacia la izquierda
+            *[ self.mat_rot.mob_matrix[i][j].animate.shift(LEFT*j*step) for i in range(n) for j in range(1, n) ], 
             # Movemos el ] de la matriz de rotación a la izquierda
-            self.mat_rot[2].animate.shift(LEFT), 
+            self.mat_rot[2].animate.shift(LEFT*spread), 
             # Movemos el vector original a la izquierda
-            self.vec_orig.animate.shift(LEFT), 
+            self.vec_orig.animate.shift(LEFT*spread), 
             # Movemos el vector rotado a la izquierda
-            self.vec_rot.animate.shift(LEFT), 
+            self.vec_rot.animate.shift(LEFT*spread), 
             # Movemos el = a la izquierda
-            self.equals.animate.shift(LEFT), 
+            self.equals.animate.shift(LEFT*spread), 
             # Movemos el ] del vector rotado a la derecha
-            self.vec_rot[2].animate.shift(RIGHT*2), 
+            self.vec_rot[2].animate.shift(RIGHT*room), 
             # Movemos los elementos del vector rotado a la derecha
-            self.vec_rot[0].animate.shift(RIGHT*0.5)
+            self.vec_rot[0].animate.shift(RIGHT*room/4)
         )
         
-        # Hacemos una copia de los elementos de la matriz de rotación y del vector original
-        mat_els_copies = [ self.mat_rot.mob_matrix[i][j].copy() for i in range(2) for j in range(2) ]
-        vec_els_copies = [ self.vec_orig.mob_matrix[i][0].copy() for i in list(range(2))*2 ]
-        
-        # Por cada fila en la matriz de rotación...
-        for i in range(2):
-            # Cogemos la posición del centro del vector rotado
-            center = self.vec_rot.mob_matrix[i][0].get_center() + 1.8*LEFT
-            
-            # Esta variable la usamos para saber qué elemento de las listas de copias coger
-            j = 0
-            if i == 0: 
-                j = 0
-            else:
-                j = 2
-            
-            # Movemos una copia de una entrada de la matriz al vector rotado
-            self.play(mat_els_copies[j].animate.move_to(center))
-            # Creamos el · de multiplicación y lo ponemos a la derecha del elemento anterior
-            mult_dot1 = MathTex(r"\cdot").next_to(mat_els_copies[j], direction = RIGHT)
-            # Animamos la creación del ·
-            self.play(FadeIn(mult_dot1))
-            # Movemos una copia de una entrada del vector original al vector rotado y lo ponemos a 
-            # la derecha del punto
-            self.play(vec_els_copies[j].animate.next_to(mult_dot1, direction = RIGHT))
-            # Creamos el + y lo ponemos a la derecha del elemento anterior
-            sum_sign = MathTex(r"+").next_to(vec_els_copies[j], direction = RIGHT)
-            # Animamos la creación del +
-            self.play(FadeIn(sum_sign))
-            
-            
-            # Movemos la copia de la entrada restante de la matriz al vector rotado
-            self.play(mat_els_copies[j + 1].animate.next_to(sum_sign, direction = RIGHT))
-            # Creamos el · de multiplicación y lo ponemos a la derecha del elemento anterior
-            mult_dot2 = MathTex(r"\cdot").next_to(mat_els_copies[j + 1], direction = RIGHT)
-            # Animamos la creación del ·
-            self.play(FadeIn(mult_dot2))
-            # Movemos una copia de una entrada del vector original al vector rotado y lo ponemos a 
-            # la derecha del punto
-            self.play(vec_els_copies[j + 1].animate.next_to(mult_dot2, direction = RIGHT))
-                
-            # Creamos un grupo con todos los elementos que componen la suma
-            aux_group = VGroup(mat_els_copies[j], mult_dot1, vec_els_copies[j], sum_sign, mat_els_copies[j + 1], mult_dot2, vec_els_copies[j + 1])
-            self.play(
-                # Transformamos el grupo anterior por el valor numérico de la entrada del vector rotado
-                ReplacementTransform(aux_group, self.vec_rot.elements[i]),
-                # Mostramos el valor del vector rotado
-                self.vec_rot.elements[i].animate.set_opacity(1)
-            ) 
+        # Escribimos las sumas de todas las filas a la vez (siempre el mismo número de animaciones)
+        for anim in product.animations():
+            self.play(anim)
         
+        # Anchura que tienen de más los elementos del vector rotado respecto a un número de 1 cifra
+        # (0 con números enteros), para dejar el ] a la derecha del más ancho
+        digit = DecimalNumber(0, num_decimal_places = 0).match_height(self.vec_rot.elements[0])
+        extra = max(0, self.vec_rot.elements.width - digit.width)
         # Movemos las matrices al centro mientras hacemos el recuadro más pequeño y el vector rotado más pequeño
         self.play(
                 self.label_group[1].animate.move_to(self.label_group[0].get_center() + RIGHT*1.5), 
-                self.label_group[0].animate.set_width(self.label_group[0].width - 2).shift(RIGHT*0.25),
-                self.vec_rot[0].animate.move_to(RIGHT*3.8),
-                self.vec_rot[2].animate.move_to(RIGHT*4.6))
+                self.label_group[0].animate.set_width(self.label_group[0].width - room).shift(RIGHT*0.25),
+                self.vec_rot[0].animate.move_to(RIGHT*(3.8 + extra/2)),
+                self.vec_rot[2].animate.move_to(RIGHT*(4.6 + extra)))
         # Movemos todo arriba a la derecha
         self.play(self.label_group.animate.scale(1/1.7).to_corner(UP+RIGHT))
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
-        
\ No newline at end of file
+
+class ProductoRotacion3D(Scene):
+    """
+        Producto de una matriz de rotación 3x3 (giro alrededor del eje Z) por un vector columna, hecho
+        con las mismas piezas que Prueba (RotationMatrix y MatrixVectorProduct).
+    """
+    angulo = 90
+    pos_inicial = (1, 0, 2)
+    
+    def construct(self):
+        n = len(self.pos_inicial)
+        # Matriz de rotación con números y el resultado del producto
+        numbers = embed_rotation(rotation_matrices(self.angulo), n)
+        result = numbers @ np.array(self.pos_inicial, dtype = float)
+        
+        mat = RotationMatrix.of(self.angulo, n = n)
+        vec = DecimalMatrix([ [x] for x in self.pos_inicial ],
+                            element_to_mobject_config = { "num_decimal_places": decimal_places(self.pos_inicial) })
+        equals = cached_tex(r"=")
+        res = DecimalMatrix([ [x] for x in result ], element_to_mobject_config = { "num_decimal_places": decimal_places(result) })
+        # Ocultamos el resultado hasta que se calcule
+        for el in res.elements: el.set_opacity(0)
+        group = VGroup(mat, vec, equals, res).arrange(RIGHT).scale(0.6).to_edge(LEFT)
+        self.play(Write(group))
+        
+        # Cambiamos los senos y cosenos por su valor
+        self.play(LaggedStart(*[
+            Transform(mat.mob_matrix[i][j], DecimalNumber(numbers[i][j], num_decimal_places = decimal_places(numbers))
+                      .move_to(mat.mob_matrix[i][j].get_center()))
+            for i in range(n) for j in range(n)
+        ], lag_ratio = 0.1))
+        
+        # Hacemos sitio en el resultado para las sumas y las animamos
+        product = MatrixVectorProduct(mat, vec, res)
+        self.play(res[2].animate.shift(RIGHT*max(product.width - res.elements.width, 0)))
+        for anim in product.animations():
+            self.play(anim)
+        self.wait(2)
+
+class RotacionNube(ArrowCloudScene):
+    """
+        La matriz de rotación actuando sobre todo el plano: una cuadrícula de más de 10000 flechas
+        (ArrowCloud) que gira el ángulo indicado con una sola multiplicación de matrices por fotograma
+        y se dibuja con rectas (ArrowCloudScene).
+    """
+    angulo = 90
+    
+    def construct(self):
+        self.add(NumberPlane())
+        cloud = ArrowCloud.grid(color = YELLOW)
+        mat_rot = RotationMatrix.of(self.angulo)
+        label = VGroup(SurroundingRectangle(mat_rot, color = BLUE, fill_color = BLACK, fill_opacity = 1), mat_rot)
+        label.scale(0.6).to_corner(UP+RIGHT)
+        
+        self.play(FadeIn(cloud), FadeIn(label))
+        self.play(RotateCloud(cloud, self.angulo, run_time = 3))
+        self.wait(2)
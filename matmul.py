@@ -0,0 +1,92 @@
+# Animación del producto de una matriz por un vector columna, para cualquier tamaño
+from manim import *
+
+from glyph_cache import cached_tex
+
+class MatrixVectorProduct:
+    """
+        Animación del producto matriz x vector columna (Matrix, IntegerMatrix, RotationMatrix...). En
+        cada fila del resultado se escribe la suma a_i1 · v_1 + a_i2 · v_2 + ... con copias de las
+        entradas de la matriz y del vector, y al final cada suma se transforma en la entrada del
+        resultado. Todas las filas se animan a la vez con LaggedStart, así que el número de
+        animaciones (self.play) es siempre el mismo, sea cual sea el tamaño de la matriz.
+
+        Parámetros
+        ----------------
+            matrix : matriz n x m.
+            vector : vector columna m x 1.
+            result : vector columna n x 1 con el resultado (sus entradas pueden estar ocultas).
+            lag_ratio : retraso entre las animaciones de cada entrada.
+
+        Atributos
+        ------------
+            width : anchura de la suma más larga (para hacer sitio antes de animar).
+
+        Métodos
+        ------------
+            animations : devuelve la lista de animaciones, que hay que reproducir en orden con self.play.
+    """
+
+    def __init__(self, matrix, vector, result, lag_ratio = 0.1):
+        self.matrix = matrix
+        self.vector = vector
+        self.result = result
+        self.lag_ratio = lag_ratio
+        self.rows = len(matrix.mob_matrix)
+        self.cols = len(matrix.mob_matrix[0])
+        self.width = max(self._row_layout(i).width for i in range(self.rows))
+
+    def _row_layout(self, i):
+        # Fila i de la suma: a_i1 · v_1 + a_i2 · v_2 + ... (las entradas son copias)
+        terms = []
+        for j in range(self.cols):
+            if j > 0:
+                terms.append(cached_tex(r"+"))
+            terms += [ self.matrix.mob_matrix[i][j].copy(), cached_tex(r"\cdot"), self.vector.mob_matrix[j][0].copy() ]
+        return VGroup(*terms).arrange(RIGHT)
+
+    def animations(self):
+        # Colocamos cada suma a la derecha del corchete izquierdo del resultado, a la altura de su fila
+        # (result[1] es el corchete izquierdo)
+        layouts = []
+        for i in range(self.rows):
+            row = self._row_layout(i).next_to(self.result[1], direction = RIGHT)
+            row.set_y(self.result.mob_matrix[i][0].get_y())
+            layouts.append(row)
+
+        mat_moves, operators, vec_moves, sums = [], [], [], []
+        for i, row in enumerate(layouts):
+            parts = []
+            for j in range(self.cols):
+                # Cada término ocupa 3 posiciones (entrada, ·, entrada) más el + anterior
+                k = 4*j
+                mat_copy = self.matrix.mob_matrix[i][j].copy()
+                mat_copy.target = row[k]
+                vec_copy = self.vector.mob_matrix[j][0].copy()
+                vec_copy.target = row[k + 2]
+                mat_moves.append(MoveToTarget(mat_copy))
+                vec_moves.append(MoveToTarget(vec_copy))
+                if j > 0:
+                    operators.append(row[k - 1])
+                    parts.append(row[k - 1])
+                operators.append(row[k + 1])
+                parts += [ mat_copy, row[k + 1], vec_copy ]
+            sums.append(VGroup(*parts))
+
+        elements = self.result.elements
+        for el in elements:
+            el.generate_target()
+            el.target.set_opacity(1)
+        return [
+            # Llevamos las entradas de la matriz a su sitio en cada suma
+            LaggedStart(*mat_moves, lag_ratio = self.lag_ratio),
+            # Mostramos los · y los +
+            LaggedStart(*[ FadeIn(op) for op in operators ], lag_ratio = self.lag_ratio),
+            # Llevamos las entradas del vector a su sitio en cada suma
+            LaggedStart(*vec_moves, lag_ratio = self.lag_ratio),
+            # Transformamos cada suma en la entrada del resultado y la mostramos
+            AnimationGroup(
+                *[ ReplacementTransform(s, el) for s, el in zip(sums, elements) ],
+                *[ MoveToTarget(el) for el in elements ],
+            ),
+        ]
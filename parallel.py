@@ -0,0 +1,134 @@
+# Renderizado de una animación repartiendo sus fotogramas entre varios procesos
+from manim import *
+import mmap
+import multiprocessing
+import os
+from collections import deque
+from contextlib import contextmanager
+
+# Escena que están renderizando los procesos hijos y fotogramas compartidos con ellos. Los hijos se
+# crean con fork, así que heredan una copia exacta de la escena justo antes del primer fotograma (no
+# hace falta serializarla) y la misma memoria compartida
+_scene = None
+_slots = None
+
+def _render_range(args):
+    start, stop, slot = args
+    frames = _slots[slot]
+    for i, k in enumerate(range(start, stop)):
+        _scene.update_to_time(_scene.parallel_times[k])
+        _scene.renderer.update_frame(_scene, _scene.moving_mobjects)
+        frames[i] = _scene.renderer.camera.pixel_array
+    return slot
+
+class ParallelScene(Scene):
+    """
+        Escena que puede renderizar una animación en varios procesos. Cada fotograma de una animación
+        depende sólo del instante t (las animaciones interpolan a partir de alpha), así que los
+        fotogramas se reparten en tramos entre procesos creados con fork en el momento de empezar la
+        animación. Cada tramo se dibuja en un hueco de memoria compartida y el proceso principal manda
+        los tramos al vídeo en orden en cuanto están listos, mientras los procesos siguen con los
+        siguientes. Sólo hay dos huecos más que procesos, así que la memoria no depende de la duración
+        de la animación. Los fotogramas son los mismos que en serie siempre que los updaters no
+        dependan de dt (tests/test_parallel.py lo comprueba).
+
+        Está desactivado por defecto: sólo se usa con PRUEBA_WORKERS (o parallel_workers) mayor que 1
+        y dentro del contexto parallel_frames, por ejemplo:
+
+            with self.parallel_frames():
+                self.play(Write(grupo, run_time = 3))
+
+        Parámetros (atributos de clase)
+        ----------------
+            parallel_workers : número de procesos (por defecto, PRUEBA_WORKERS o 1, es decir, en serie).
+            parallel_min_frames : las animaciones con menos fotogramas se renderizan en serie.
+            parallel_chunk_frames : fotogramas de cada tramo.
+
+        Métodos
+        ------------
+            parallel_frames : contexto en el que las animaciones se renderizan en paralelo.
+    """
+    parallel_workers = int(os.environ.get("PRUEBA_WORKERS", 1))
+    parallel_min_frames = 24
+    parallel_chunk_frames = 4
+
+    @contextmanager
+    def parallel_frames(self, workers = None):
+        self._parallel = workers or self.parallel_workers
+        try:
+            yield
+        finally:
+            self._parallel = None
+
+    def _can_run_parallel(self):
+        return (
+            getattr(self, "_parallel", None) is not None and self._parallel > 1
+            and getattr(self, "stop_condition", None) is None
+            and not self.renderer.skip_animations
+            and "fork" in multiprocessing.get_all_start_methods()
+            # Los procesos de un Pool (render_daemon, sweep) no pueden crear procesos hijos
+            and not multiprocessing.current_process().daemon
+        )
+
+    def play_internal(self, skip_rendering = False):
+        if skip_rendering or not self._can_run_parallel():
+            return super().play_internal(skip_rendering)
+
+        self.duration = self.get_run_time(self.animations)
+        progression = self._get_animation_time_progression(self.animations, self.duration)
+        self.parallel_times = list(progression)
+        progression.close()
+        num_frames = len(self.parallel_times)
+        if num_frames < self.parallel_min_frames:
+            self._play_frames(0, num_frames)
+        else:
+            self._play_parallel(num_frames)
+
+        for animation in self.animations:
+            animation.finish()
+            animation.clean_up_from_scene(self)
+        if not self.renderer.skip_animations:
+            self.update_mobjects(0)
+        self.renderer.static_image = None
+
+    def _play_frames(self, start, stop):
+        # Igual que Scene.play_internal, para tramos demasiado cortos para repartirlos
+        for t in self.parallel_times[start:stop]:
+            self.update_to_time(t)
+            self.renderer.render(self, t, self.moving_mobjects)
+
+    def _play_parallel(self, num_frames):
+        global _scene, _slots
+        chunk = self.parallel_chunk_frames
+        ranges = [ (start, min(start + chunk, num_frames)) for start in range(0, num_frames, chunk) ]
+        # Huecos de memoria compartida (anónima, la heredan los hijos) para los tramos en vuelo
+        num_slots = min(len(ranges), self._parallel + 2)
+        shape = (num_slots, chunk) + self.renderer.camera.pixel_array.shape
+        memory = mmap.mmap(-1, int(np.prod(shape)))
+        _slots = np.frombuffer(memory, dtype = np.uint8).reshape(shape)
+        _scene = self
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(self._parallel) as pool:
+                # Tramos pendientes, en orden: los procesos libres cogen el siguiente de la cola
+                pending = deque()
+                next_range = 0
+                for slot in range(num_slots):
+                    start, stop = ranges[next_range]
+                    pending.append((stop - start, pool.apply_async(_render_range, ((start, stop, slot),))))
+                    next_range += 1
+                while pending:
+                    count, result = pending.popleft()
+                    slot = result.get()
+                    # Mandamos el tramo al vídeo y reutilizamos su hueco para el siguiente
+                    for frame in _slots[slot][:count]:
+                        self.renderer.add_frame(frame)
+                    if next_range < len(ranges):
+                        start, stop = ranges[next_range]
+                        pending.append((stop - start, pool.apply_async(_render_range, ((start, stop, slot),))))
+                        next_range += 1
+        finally:
+            _scene = None
+            _slots = None
+        # Dejamos la escena del proceso principal en el último fotograma, como en serie
+        self.update_to_time(self.parallel_times[-1])
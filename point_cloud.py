@@ -0,0 +1,145 @@
+# Nube de flechas guardada en arrays, para rotar miles de vectores a la vez
+from manim import *
+
+from rotation import rotation_matrices
+
+# Cada flecha son 4 segmentos (el tallo y los 3 lados de la punta) de 4 puntos cada uno
+_POINTS_PER_ARROW = 16
+# Posición de los 4 puntos de cada segmento (curvas de Bézier cúbicas que son rectas)
+_T = np.array([0, 1/3, 2/3, 1])[:, None]
+# Puntos de cada flecha que hacen falta para dibujarla con rectas: principio y final del tallo, y
+# los tres vértices de la punta (izquierda, extremo, derecha)
+_CORNERS = [0, 3, 4, 7, 11]
+
+class ArrowCloud(VMobject):
+    """
+        Conjunto de flechas en un solo VMobject. Los vectores se guardan en un array N x 2 y los puntos
+        de todas las flechas en un único array contiguo (16 por flecha), así que rotar la nube es una
+        sola multiplicación de matrices por fotograma en lugar de un Vector y un updater por flecha.
+
+        Las rotaciones son siempre respecto al origen y a partir de la posición inicial (template), de
+        modo que no se acumulan errores al animar. Para dibujarla hace falta ArrowCloudCamera (o una
+        ArrowCloudScene), que pasa a Cairo los vértices de cada flecha como rectas en lugar de
+        recorrer sus curvas una a una; python benchmark.py --cloud mide el coste por fotograma de la
+        actualización y del dibujo.
+
+        Parámetros
+        ----------------
+            vectors : array N x 2 con el vector de cada flecha.
+            starts : array N x 2 con el origen de cada flecha (por defecto, el origen de coordenadas).
+            tip_length : longitud de las puntas.
+            tip_width : anchura de las puntas.
+
+        Métodos
+        ------------
+            grid : crea una flecha pequeña en cada punto de una cuadrícula.
+            set_rotation : gira toda la nube un ángulo (en grados) respecto a su posición inicial.
+            current_vectors : devuelve los vectores ya rotados.
+    """
+
+    def __init__(self, vectors, starts = None, tip_length = 0.08, tip_width = 0.06, **kwargs):
+        kwargs.setdefault("stroke_width", 1)
+        kwargs.setdefault("fill_opacity", 1)
+        VMobject.__init__(self, **kwargs)
+        self.vectors = np.ascontiguousarray(vectors, dtype = float).reshape(-1, 2)
+        self.starts = np.zeros_like(self.vectors) if starts is None else \
+            np.ascontiguousarray(starts, dtype = float).reshape(-1, 2)
+        self.tip_length = tip_length
+        self.tip_width = tip_width
+        # Ángulo actual (en grados) respecto a la posición inicial
+        self.angle = 0
+        # Puntos (x, y) de todas las flechas sin rotar
+        self.template = self._arrow_points()
+        points = np.zeros((len(self.template), 3))
+        points[:, :2] = self.template
+        self.set_points(points)
+
+    @classmethod
+    def grid(cls, x_range = (-7, 7), y_range = (-4, 4), step = 0.1, length = 0.07, **kwargs):
+        xs = np.arange(x_range[0], x_range[1] + step/2, step)
+        ys = np.arange(y_range[0], y_range[1] + step/2, step)
+        starts = np.stack(np.meshgrid(xs, ys), axis = -1).reshape(-1, 2)
+        vectors = np.tile([length, 0.0], (len(starts), 1))
+        return cls(vectors, starts = starts, tip_length = length/2, tip_width = length/2, **kwargs)
+
+    def _arrow_points(self):
+        n = len(self.vectors)
+        lengths = np.linalg.norm(self.vectors, axis = 1)
+        # Dirección de cada flecha (las de longitud 0 quedan como un punto)
+        u = np.divide(self.vectors, lengths[:, None], out = np.zeros_like(self.vectors), where = lengths[:, None] > 0)
+        normal = np.stack([-u[:, 1], u[:, 0]], axis = 1)
+        tip = np.minimum(self.tip_length, lengths)[:, None]
+        ends = self.starts + self.vectors
+        base = ends - u*tip
+        left = base + normal*self.tip_width/2
+        right = base - normal*self.tip_width/2
+
+        # Extremos de los 4 segmentos de cada flecha: tallo, y punta (izquierda -> punta -> derecha -> izquierda)
+        a = np.stack([self.starts, left, ends, right], axis = 1)
+        b = np.stack([base, ends, right, left], axis = 1)
+        # Puntos de cada segmento: a + t*(b - a) -> forma (N, 4, 4, 2)
+        points = a[:, :, None, :] + _T*(b - a)[:, :, None, :]
+        return np.ascontiguousarray(points.reshape(n*_POINTS_PER_ARROW, 2))
+
+    def set_rotation(self, angle):
+        self.angle = angle
+        matrix = rotation_matrices(angle)
+        # Todos los puntos a la vez: p' = R p (por filas, p' = p R^T)
+        np.matmul(self.template, matrix.T, out = self.points[:, :2])
+        return self
+
+    def current_vectors(self):
+        return self.vectors @ rotation_matrices(self.angle).T
+
+class RotateCloud(Animation):
+    """
+        Gira una ArrowCloud un ángulo (en grados) respecto al origen. En cada fotograma sólo se
+        recalculan los puntos de la nube con una multiplicación de matrices.
+    """
+
+    def __init__(self, cloud, angle, **kwargs):
+        self.angle = angle
+        self.start_angle = cloud.angle
+        Animation.__init__(self, cloud, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_rotation(self.start_angle + self.rate_func(alpha)*self.angle)
+
+class ArrowCloudCamera(Camera):
+    """
+        Cámara que dibuja las ArrowCloud con rectas. La cámara normal recorre los puntos de cada
+        VMobject en Python para partirlos en subcaminos y pasa a Cairo cada curva con curve_to (unas
+        45000 por fotograma en RotacionNube); aquí los vértices de todas las flechas se sacan con una
+        sola indexación de NumPy y cada flecha son dos subcaminos de rectas (el tallo y la punta
+        cerrada), que es el mismo dibujo. Si los puntos de la nube ya no tienen la forma de
+        ArrowCloud (16 por flecha), se dibuja como cualquier otro VMobject.
+    """
+
+    def set_cairo_context_path(self, ctx, vmobject):
+        if not isinstance(vmobject, ArrowCloud):
+            return super().set_cairo_context_path(ctx, vmobject)
+        points = self.transform_points_pre_display(vmobject, vmobject.points)
+        n = len(vmobject.vectors)
+        if n == 0 or len(points) != n*_POINTS_PER_ARROW:
+            return super().set_cairo_context_path(ctx, vmobject)
+
+        corners = points.reshape(n, _POINTS_PER_ARROW, 3)[:, _CORNERS, :2].tolist()
+        ctx.new_path()
+        move_to, line_to, close_path = ctx.move_to, ctx.line_to, ctx.close_path
+        for (x0, y0), (x1, y1), (x2, y2), (x3, y3), (x4, y4) in corners:
+            move_to(x0, y0)
+            line_to(x1, y1)
+            move_to(x2, y2)
+            line_to(x3, y3)
+            line_to(x4, y4)
+            close_path()
+        return self
+
+class ArrowCloudScene(Scene):
+    """
+        Escena que usa ArrowCloudCamera para dibujar las ArrowCloud.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("camera_class", ArrowCloudCamera)
+        super().__init__(*args, **kwargs)
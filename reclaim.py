@@ -0,0 +1,81 @@
+# Escena que elimina automáticamente los objetos que ya no se ven
+from manim import *
+
+def _is_invisible(mob):
+    # Un objeto es invisible si ninguno de los miembros de su familia con puntos tiene opacidad
+    members = mob.family_members_with_points()
+    for member in members:
+        if not isinstance(member, VMobject):
+            # Imágenes, nubes de puntos... no sabemos si se ven, así que las dejamos
+            return False
+        if (member.get_fill_opacities() > 0).any() or (member.get_stroke_opacities() > 0).any():
+            return False
+        if (member.get_stroke_opacities(background = True) > 0).any():
+            return False
+    return True
+
+def _num_points(mob):
+    return sum(len(member.points) for member in mob.family_members_with_points())
+
+def _supersedes(anim):
+    # Transform que deja anim.mobject encima de otro objeto. FadeIn, GrowFromCenter... también son
+    # Transform, pero su destino es el propio objeto (o una copia) y lo introducen en la escena
+    return isinstance(anim, Transform) and not isinstance(anim, ReplacementTransform) \
+        and not anim.is_introducer() and anim.target_mobject is not None \
+        and anim.target_mobject is not anim.mobject
+
+class ReclaimingScene(Scene):
+    """
+        Escena que, antes y después de cada animación, quita de la escena los objetos de primer nivel
+        que ya no aportan nada al fotograma, para que las animaciones siguientes no tengan que
+        recorrerlos ni dibujarlos:
+            - los que son totalmente transparentes (por ejemplo, tras hacer set_opacity(0)).
+            - los que se han transformado (Transform) en un objeto que ya está en la escena, ya que al
+              acabar la animación quedan exactamente encima de él. Las animaciones que introducen un
+              objeto (FadeIn, GrowFromCenter...) no cuentan, aunque también sean Transform.
+        Los objetos con updaters no se tocan. Si un objeto eliminado se vuelve a animar, la animación
+        lo vuelve a añadir a la escena; si se vuelve a mostrar sin animación hay que añadirlo con self.add.
+
+        Atributos
+        ------------
+            reclaimed_mobjects : número de objetos eliminados hasta ahora.
+            reclaimed_points : número de puntos de esos objetos.
+
+        Métodos
+        ------------
+            reclaim : elimina los objetos invisibles o sustituidos y devuelve cuántos ha eliminado.
+    """
+
+    def setup(self):
+        super().setup()
+        self.reclaimed_mobjects = 0
+        self.reclaimed_points = 0
+
+    def play(self, *args, **kwargs):
+        # Lo que se ocultó entre animaciones se quita antes de empezar la siguiente
+        self.reclaim()
+        super().play(*args, **kwargs)
+        self.reclaim(args)
+
+    def reclaim(self, animations = ()):
+        # Objetos que se han transformado en otro que ya se está mostrando
+        displayed = set(map(id, self.get_mobject_family_members()))
+        superseded = set()
+        for anim in animations:
+            if _supersedes(anim) and id(anim.target_mobject) in displayed:
+                superseded.add(id(anim.mobject))
+
+        garbage = [ mob for mob in self.mobjects
+                    if not mob.get_family_updaters() and (id(mob) in superseded or _is_invisible(mob)) ]
+        if garbage:
+            self.reclaimed_mobjects += len(garbage)
+            self.reclaimed_points += sum(_num_points(mob) for mob in garbage)
+            self.remove(*garbage)
+        return len(garbage)
+
+    def tear_down(self):
+        super().tear_down()
+        logger.info(
+            "%s: eliminados %d objetos invisibles o sustituidos (%d puntos)",
+            type(self).__name__, self.reclaimed_mobjects, self.reclaimed_points
+        )
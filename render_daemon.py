@@ -0,0 +1,162 @@
+# Procesos de render siempre en marcha que reciben trabajos por un socket Unix
+#
+# Ejemplos:
+#   python render_daemon.py serve --socket /tmp/prueba.sock --workers 4 --max-jobs 50
+#   python render_daemon.py submit --socket /tmp/prueba.sock --angle 45 --vector 1 0 --output giro45
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+
+from jobs import job_id, run_job
+
+DEFAULT_SOCKET = "/tmp/prueba_render.sock"
+
+def warm_up():
+    """
+        Carga Manim, la escena y todos los glifos que usa Prueba (en memoria y en la caché en disco),
+        para que los procesos que se creen después los hereden ya preparados.
+    """
+    import main
+    from atlas_decimal import AtlasDecimalNumber
+    from glyph_cache import cached_tex, cached_text
+
+    # La matriz de Prueba (senos, cosenos y la letra) y el resto de símbolos de la escena
+    main.RotationMatrix.of(r"\alpha", is_number = False)
+    for tex in (r"=", r",", r"\cdot", r"+"):
+        cached_tex(tex)
+    # Los paréntesis de las coordenadas son Text: así se cargan también Pango y las fuentes
+    for text in ("(", ")"):
+        cached_text(text)
+    # Todos los dígitos, el signo y el punto decimal
+    AtlasDecimalNumber(-1234567890.5, 1)
+    return main
+
+class _Handler(socketserver.StreamRequestHandler):
+    # Cada línea que llega es un trabajo en JSON; se responde con otra línea en JSON
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            start = time.perf_counter()
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                response = dict(status = "error", error = "JSON no válido: {}".format(e))
+            else:
+                response = self.server.dispatch(job)
+            response["total_seconds"] = time.perf_counter() - start
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+class RenderDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+        Servidor que recibe trabajos de render por un socket Unix y los reparte entre un pool de
+        procesos. Manim y los glifos se cargan una vez en el proceso principal antes de crear el pool,
+        así que cada proceso empieza ya preparado (se crean con fork). Cada proceso se sustituye por
+        uno nuevo tras max_jobs trabajos para que la memoria no crezca sin límite.
+
+        Los trabajos son líneas JSON con los campos de jobs.render_prueba (angle, vector, quality,
+        resolution, output). También se aceptan {"command": "ping"} y {"command": "shutdown"}. Cada
+        trabajo recibe un id único, que da nombre a su escena (y a su vídeo si no se indica output),
+        así que los trabajos que se renderizan a la vez no comparten directorios.
+
+        Si ya hay un servidor escuchando en socket_path se lanza un error en lugar de quitarle el
+        socket.
+
+        Parámetros
+        ----------------
+            socket_path : ruta del socket Unix.
+            workers : número de procesos de render.
+            max_jobs : trabajos que hace cada proceso antes de sustituirlo.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, workers = None, max_jobs = 50):
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+        _claim_socket(socket_path)
+        warm_up()
+        self.pool = multiprocessing.get_context("fork").Pool(self.workers, maxtasksperchild = max_jobs)
+        socketserver.UnixStreamServer.__init__(self, socket_path, _Handler)
+
+    def dispatch(self, job):
+        command = job.get("command")
+        if command == "ping":
+            return dict(status = "ok", workers = self.workers)
+        if command == "shutdown":
+            # shutdown() espera a que acabe serve_forever, así que se llama desde otro hilo
+            threading.Thread(target = self.shutdown).start()
+            return dict(status = "ok")
+        if "angle" not in job:
+            return dict(status = "error", error = "falta el campo angle")
+        job = dict(job, id = "{}_{}".format(job_id(job), uuid.uuid4().hex[:8]))
+        return self.pool.apply(run_job, (job,))
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        self.pool.close()
+        self.pool.join()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+def _claim_socket(socket_path):
+    # Quita el socket de un servidor anterior que ya no está en marcha; si sigue en marcha, error
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.remove(socket_path)
+            return
+    raise RuntimeError("Ya hay un servidor escuchando en {}".format(socket_path))
+
+def submit(job, socket_path = DEFAULT_SOCKET):
+    """
+        Manda un trabajo al servidor y devuelve su respuesta
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(job) + "\n").encode())
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Servidor de render de Prueba")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    serve = commands.add_parser("serve", help = "arranca el servidor")
+    serve.add_argument("--socket", default = DEFAULT_SOCKET)
+    serve.add_argument("--workers", type = int, help = "procesos de render (por defecto, uno por CPU)")
+    serve.add_argument("--max-jobs", type = int, default = 50, help = "trabajos por proceso antes de sustituirlo")
+
+    send = commands.add_parser("submit", help = "manda un trabajo al servidor")
+    send.add_argument("--socket", default = DEFAULT_SOCKET)
+    send.add_argument("--angle", type = float, required = True)
+    send.add_argument("--vector", type = float, nargs = 2, default = [1, 0])
+    send.add_argument("--quality")
+    send.add_argument("--resolution", help = "por ejemplo 1280x720")
+    send.add_argument("--output")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        with RenderDaemon(args.socket, args.workers, args.max_jobs) as server:
+            print("Escuchando en", args.socket)
+            server.serve_forever()
+        return 0
+
+    job = { key : getattr(args, key) for key in ("angle", "vector", "quality", "resolution", "output") if getattr(args, key) is not None }
+    response = submit(job, args.socket)
+    print(json.dumps(response, indent = 2))
+    return 0 if response.get("status") == "ok" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
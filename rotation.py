@@ -0,0 +1,70 @@
+# Rotaciones en 2D vectorizadas con NumPy
+import numpy as np
+
+# Los valores más pequeños que esto se consideran 0 (cos(90º) no da 0 exacto y se vería "-0")
+EPS = 1e-12
+
+def rotation_matrices(angles, degrees = True, out = None):
+    """
+        Devuelve las matrices de rotación de todos los ángulos a la vez.
+
+        Parámetros
+        ----------------
+            angles : número o array de ángulos con forma S.
+            degrees : booleano que indica si los ángulos están en grados (si no, en radianes).
+            out : array opcional con forma S + (2, 2) donde escribir el resultado.
+
+        Devuelve un array con forma S + (2, 2) donde out[..., :, :] = [[cos, -sin], [sin, cos]].
+    """
+    theta = np.asarray(angles, dtype = float)
+    if degrees:
+        theta = np.deg2rad(theta)
+    if out is None:
+        out = np.empty(theta.shape + (2, 2))
+    # Calculamos cada seno y coseno una sola vez, directamente sobre el resultado
+    np.cos(theta, out = out[..., 0, 0])
+    np.sin(theta, out = out[..., 1, 0])
+    np.copyto(out[..., 0, 0], 0.0, where = np.abs(out[..., 0, 0]) < EPS)
+    np.copyto(out[..., 1, 0], 0.0, where = np.abs(out[..., 1, 0]) < EPS)
+    np.negative(out[..., 1, 0], out = out[..., 0, 1])
+    out[..., 1, 1] = out[..., 0, 0]
+    # Evitamos el -0 cuando el seno es 0
+    out[..., 0, 1] += 0.0
+    return out
+
+def compose(*angles, degrees = True):
+    """
+        Matrices de la composición de varias rotaciones. En 2D rotar a y después b es rotar a + b, así que
+        basta con sumar los ángulos (que pueden ser arrays con formas compatibles).
+    """
+    return rotation_matrices(np.sum(np.broadcast_arrays(*angles), axis = 0), degrees = degrees)
+
+def rotate_points(points, angles, degrees = True, out = None):
+    """
+        Rota N puntos por uno o varios ángulos en una sola llamada.
+
+        Parámetros
+        ----------------
+            points : array N x 2 (o un solo punto de 2 coordenadas).
+            angles : número o array de ángulos con forma S.
+            degrees : booleano que indica si los ángulos están en grados (si no, en radianes).
+            out : array opcional con forma S + (N, 2) donde escribir el resultado.
+
+        Devuelve un array con forma S + (N, 2) (o S + (2,) si points era un solo punto).
+    """
+    pts = np.asarray(points, dtype = float)
+    mats = rotation_matrices(angles, degrees = degrees)
+    if pts.ndim == 1:
+        return np.einsum("...ij,j->...i", mats, pts, out = out)
+    return np.einsum("...ij,nj->...ni", mats, pts, out = out)
+
+def embed_rotation(mats, n):
+    """
+        Convierte matrices de rotación 2x2 (forma S + (2, 2)) en matrices n x n que giran en el plano de
+        los dos primeros ejes y dejan el resto igual (forma S + (n, n)).
+    """
+    mats = np.asarray(mats, dtype = float)
+    out = np.zeros(mats.shape[:-2] + (n, n))
+    out[..., range(n), range(n)] = 1.0
+    out[..., :2, :2] = mats
+    return out
@@ -0,0 +1,197 @@
+# Caché de secciones: las partes de construct() que no han cambiado no se vuelven a ejecutar
+from manim import *
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+
+from disk_cache import DiskLRU
+
+# Directorio del proyecto: sus módulos auxiliares (rotation.py, atlas_decimal.py...) forman parte de la
+# clave de todas las secciones
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _project_file(module):
+    # Ruta del fichero del módulo si es uno de los del proyecto (None si no)
+    path = getattr(module, "__file__", None)
+    if path and path.endswith(".py") and os.path.dirname(os.path.abspath(path)) == _PROJECT_DIR:
+        return os.path.abspath(path)
+    return None
+
+class SectionCacheScene(Scene):
+    """
+        Escena cuyas partes se ejecutan como secciones con nombre (run_section). Cada sección tiene
+        una clave calculada a partir de:
+            - el código fuente del método de la sección, de los métodos de los que depende y de
+              section_dependencies.
+            - el contenido de los módulos del proyecto que usa la escena (rotation.py,
+              atlas_decimal.py, glyph_cache.py...), salvo el de la propia escena, del que sólo
+              cuentan los métodos anteriores. Así, cambiar una función auxiliar invalida la caché
+              aunque no esté en section_dependencies.
+            - sus argumentos y los parámetros de section_params (por ejemplo, la posición inicial).
+            - la calidad del vídeo.
+            - la clave de la sección anterior, que resume el estado con el que empieza la sección.
+        Si la clave está en la caché, en lugar de ejecutar la sección se restaura el estado de la
+        escena al acabarla (los atributos de state_attributes y los objetos en pantalla) y se añaden
+        sus vídeos parciales. Si no, se ejecuta y se guarda todo en la caché, que tiene un tamaño
+        máximo y expulsa las secciones usadas hace más tiempo.
+
+        Con disable_caching (--disable_caching) las secciones se ejecutan siempre.
+
+        Parámetros (atributos de clase)
+        ----------------
+            state_attributes : nombres de los atributos que forman el estado de la escena.
+            section_dependencies : clases o funciones cuyo código afecta a todas las secciones.
+            section_cache_mb : tamaño máximo de la caché (por defecto, PRUEBA_SECTION_CACHE_MB o 512).
+
+        Métodos
+        ------------
+            run_section : ejecuta un método como sección (o la restaura de la caché).
+            section_params : parámetros de la escena que forman parte de la clave.
+            reset_sections : indica que la siguiente sección empieza con la escena vacía.
+    """
+    state_attributes = ()
+    section_dependencies = ()
+    section_cache_mb = int(os.environ.get("PRUEBA_SECTION_CACHE_MB", 512))
+
+    def setup(self):
+        super().setup()
+        self.reset_sections()
+        self.section_stats = dict(hits = 0, misses = 0)
+
+    def reset_sections(self):
+        # Clave de la última sección: resume el estado de la escena
+        self.section_chain = ""
+
+    def section_params(self):
+        return ()
+
+    def _section_cache(self):
+        return DiskLRU(os.path.join(config.media_dir, "section_cache"),
+                       self.section_cache_mb * 1024 * 1024, suffix = ".section")
+
+    def _source(self, name):
+        # Código de todas las definiciones del método en la jerarquía (subclases que lo envuelven incluidas)
+        sources = []
+        for klass in type(self).__mro__:
+            if name in klass.__dict__:
+                try:
+                    sources.append(inspect.getsource(klass.__dict__[name]))
+                except (OSError, TypeError):
+                    sources.append(klass.__qualname__ + "." + name)
+        return sources
+
+    def _module_sources(self, names):
+        # Huella de los módulos del proyecto de los que depende la escena: los de las clases de la
+        # escena y, recursivamente, los que importan. Los que definen los métodos de la sección no
+        # cuentan (de esos ya se usa el código de cada método)
+        own = set()
+        pending = []
+        for klass in type(self).__mro__:
+            module = sys.modules.get(klass.__module__)
+            if _project_file(module):
+                pending.append(module)
+                if any(name in klass.__dict__ for name in names):
+                    own.add(module)
+        seen = set()
+        while pending:
+            module = pending.pop()
+            if module in seen:
+                continue
+            seen.add(module)
+            for value in list(vars(module).values()):
+                if inspect.ismodule(value):
+                    dep = value
+                else:
+                    name = getattr(value, "__module__", None)
+                    dep = sys.modules.get(name) if isinstance(name, str) else None
+                if dep not in seen and _project_file(dep):
+                    pending.append(dep)
+        h = hashlib.sha256()
+        for path in sorted(_project_file(module) for module in seen - own):
+            h.update(os.path.basename(path).encode())
+            with open(path, "rb") as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    def _section_key(self, name, args, depends_on):
+        sources = [ self._source(dep) for dep in (name,) + tuple(depends_on) ]
+        for dep in self.section_dependencies:
+            sources.append(inspect.getsource(dep))
+        quality = (config.pixel_width, config.pixel_height, config.frame_rate,
+                   str(config.background_color), config.movie_file_extension)
+        sources.append(self._module_sources((name,) + tuple(depends_on)))
+        raw = repr((sources, args, self.section_params(), quality, self.section_chain))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def run_section(self, name, *args, depends_on = ()):
+        method = getattr(self, name)
+        self.next_section(name)
+        if config.disable_caching or self.renderer.skip_animations:
+            return method(*args)
+
+        key = self._section_key(name, args, depends_on)
+        cache = self._section_cache()
+        data = cache.get(key)
+        if data is not None:
+            try:
+                self._restore_section(pickle.loads(data))
+                self.section_chain = key
+                self.section_stats["hits"] += 1
+                logger.info("Sección %s recuperada de la caché", name)
+                return
+            except Exception as e:
+                logger.warning("No se ha podido recuperar la sección %s (%s); se vuelve a renderizar", name, e)
+
+        self.section_stats["misses"] += 1
+        video_start = self.renderer.time
+        plays_start = self.renderer.num_plays
+        result = method(*args)
+        self._store_section(cache, key, self.renderer.time - video_start, self.renderer.num_plays - plays_start)
+        self.section_chain = key
+        return result
+
+    def _store_section(self, cache, key, duration, plays):
+        movies = []
+        for path in self.renderer.file_writer.sections[-1].partial_movie_files:
+            if path is None:
+                movies.append(None)
+            else:
+                with open(path, "rb") as f:
+                    movies.append((os.path.basename(path), f.read()))
+        state = { name : getattr(self, name) for name in self.state_attributes if hasattr(self, name) }
+        state["mobjects"] = self.mobjects
+        state["foreground_mobjects"] = self.foreground_mobjects
+        try:
+            data = pickle.dumps(dict(state = state, movies = movies, duration = duration, plays = plays),
+                                protocol = pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning("No se puede guardar la sección en la caché: %s", e)
+            return
+        cache.put(key, data)
+
+    def _restore_section(self, entry):
+        writer = self.renderer.file_writer
+        files = []
+        for movie in entry["movies"]:
+            if movie is None:
+                files.append(None)
+                continue
+            name, data = movie
+            path = os.path.join(writer.partial_movie_directory, name)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+            files.append(path)
+        state = entry["state"]
+        self.mobjects = state.pop("mobjects")
+        self.foreground_mobjects = state.pop("foreground_mobjects")
+        for name, value in state.items():
+            setattr(self, name, value)
+        # combine_to_movie junta la lista de toda la escena (y open_movie_pipe la indexa con num_plays),
+        # así que los vídeos recuperados van en las dos listas, en el orden en que se reprodujeron
+        writer.sections[-1].partial_movie_files.extend(files)
+        writer.partial_movie_files.extend(files)
+        self.renderer.num_plays += entry["plays"]
+        self.renderer.time += entry["duration"]
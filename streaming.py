@@ -0,0 +1,171 @@
+# Escritura del vídeo en un hilo aparte, en paralelo con el dibujo de los fotogramas
+from manim import *
+import os
+import queue
+import threading
+import time
+import weakref
+
+# Escenas con el hilo de escritura en marcha. Antes de cualquier fork (por ejemplo, los procesos de
+# ParallelScene) se paran sus hilos: un proceso con hilos no se puede copiar con seguridad, y el hijo
+# heredaría la tubería de ffmpeg en mitad de una escritura. El hilo se vuelve a crear en el siguiente
+# fotograma
+_running = weakref.WeakSet()
+
+def _stop_before_fork():
+    for scene in list(_running):
+        scene._stop_encoder()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before = _stop_before_fork)
+
+class StreamingEncoderScene(Scene):
+    """
+        Escena que separa el dibujo de los fotogramas de su escritura en el vídeo. Al principio se
+        reservan varios buffers del tamaño de un fotograma; la cámara dibuja cada fotograma
+        directamente en uno de los buffers libres (sin copiarlo después) y el buffer se mete en una
+        cola. Un hilo lo escribe en el proceso de ffmpeg mientras la escena ya está dibujando el
+        siguiente. Si el hilo va más lento, la escena espera a que quede un buffer libre
+        (contrapresión), así que la memoria no crece.
+
+        Antes de cerrar el vídeo de cada animación, y antes de cualquier escritura que no pase por la
+        cola, se espera a que la cola se vacíe para que los fotogramas no cambien de orden. Antes de
+        un fork se vacía la cola y se para el hilo.
+
+        Parámetros (atributos de clase)
+        ----------------
+            encoder_buffers : número de buffers (tamaño de la cola). Con 0 se escribe como siempre.
+                                       Por defecto, PRUEBA_ENCODER_BUFFERS o 8.
+
+        Atributos
+        ------------
+            encoder_stats : fotogramas escritos, profundidad máxima y media de la cola, número de veces
+                                  que la escena ha tenido que esperar a un buffer libre y segundos que ha
+                                  pasado el hilo escribiendo.
+    """
+    encoder_buffers = int(os.environ.get("PRUEBA_ENCODER_BUFFERS", 8))
+
+    def setup(self):
+        super().setup()
+        self.encoder_stats = dict(frames = 0, max_depth = 0, mean_depth = 0.0, waits = 0, encode_seconds = 0.0)
+        self._encoder = None
+        if self.encoder_buffers > 0:
+            self._install_encoder()
+
+    def _install_encoder(self):
+        renderer = self.renderer
+        writer = renderer.file_writer
+        # Escritura original (la que hace el hilo)
+        self._write_frame = writer.write_frame
+        # Fotogramas pendientes de escribir y buffers libres
+        self._pending = queue.Queue(maxsize = self.encoder_buffers)
+        self._free = queue.Queue()
+        self._buffers = None
+        self._depth_sum = 0
+        self._encoder_error = None
+
+        def write_frame(*args, **kwargs):
+            # Escrituras que no pasan por la cola (por ejemplo, fotogramas congelados)
+            self._drain()
+            return self._write_frame(*args, **kwargs)
+
+        end_animation = writer.end_animation
+
+        def end(*args, **kwargs):
+            self._drain()
+            return end_animation(*args, **kwargs)
+
+        writer.write_frame = write_frame
+        writer.end_animation = end
+        renderer.render = self._render
+
+    def _start_encoder(self):
+        self._encoder = threading.Thread(target = self._encode_loop, name = "encoder", daemon = True)
+        self._encoder.start()
+        _running.add(self)
+
+    def _stop_encoder(self):
+        # Vacía la cola y para el hilo; los errores de escritura se lanzan en el siguiente _drain
+        if self._encoder is None:
+            return
+        self._pending.join()
+        self._pending.put(None)
+        self._encoder.join()
+        self._encoder = None
+        _running.discard(self)
+
+    def _render(self, scene, time, moving_mobjects):
+        # Igual que CairoRenderer.render, pero el fotograma se dibuja en un buffer libre que va a la
+        # cola en lugar de escribirse
+        renderer = self.renderer
+        camera = renderer.camera
+        if renderer.skip_animations:
+            renderer.update_frame(scene, moving_mobjects)
+            return
+        if self._encoder is None:
+            self._start_encoder()
+        if self._buffers is None:
+            self._buffers = [ np.empty_like(camera.pixel_array) for _ in range(self.encoder_buffers) ]
+            for buf in self._buffers:
+                self._free.put(buf)
+        if self._free.empty():
+            self.encoder_stats["waits"] += 1
+        buf = self._free.get()
+        # La cámara dibuja directamente en el buffer (Camera guarda un contexto de Cairo por array, así
+        # que cada buffer tiene el suyo). Después recupera su propio array, para que lo que se dibuje
+        # fuera de _render no pise un fotograma que todavía está en la cola
+        own = camera.pixel_array
+        camera.pixel_array = buf
+        try:
+            renderer.update_frame(scene, moving_mobjects)
+        except BaseException:
+            self._free.put(buf)
+            raise
+        finally:
+            camera.pixel_array = own
+        renderer.time += 1 / camera.frame_rate
+        self._pending.put(buf)
+
+        depth = self._pending.qsize()
+        stats = self.encoder_stats
+        stats["frames"] += 1
+        stats["max_depth"] = max(stats["max_depth"], depth)
+        self._depth_sum += depth
+        stats["mean_depth"] = self._depth_sum / stats["frames"]
+
+    def _encode_loop(self):
+        while True:
+            buf = self._pending.get()
+            try:
+                if buf is None:
+                    return
+                if self._encoder_error is None:
+                    start = time.perf_counter()
+                    self._write_frame(buf)
+                    self.encoder_stats["encode_seconds"] += time.perf_counter() - start
+            except BaseException as e:
+                # El error se lanza en el hilo principal en el siguiente _drain
+                self._encoder_error = e
+            finally:
+                if buf is not None:
+                    self._free.put(buf)
+                self._pending.task_done()
+
+    def _drain(self):
+        if self._encoder is not None:
+            self._pending.join()
+        if self._encoder_error is not None:
+            error, self._encoder_error = self._encoder_error, None
+            raise error
+
+    def tear_down(self):
+        if self.encoder_buffers > 0:
+            self._stop_encoder()
+            self._drain()
+            logger.info(
+                "Codificador: %d fotogramas, cola máxima %d, media %.1f, %d esperas, %.2f s escribiendo",
+                self.encoder_stats["frames"], self.encoder_stats["max_depth"],
+                self.encoder_stats["mean_depth"], self.encoder_stats["waits"],
+                self.encoder_stats["encode_seconds"]
+            )
+        super().tear_down()
@@ -0,0 +1,194 @@
+# Barridos de parámetros de Prueba: renderiza todos los trabajos de un manifiesto en paralelo
+#
+# Ejemplo:
+#   python sweep.py barrido.jsonl --quality low_quality
+#
+# Manifiesto JSONL (una línea por trabajo):
+#   {"angle": 45, "vector": [1, 0], "resolution": "1280x720", "output": "giro45"}
+# Manifiesto CSV (con cabecera):
+#   angle,x,y,resolution,output
+#   45,1,0,1280x720,giro45
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from jobs import job_id, job_size, parse_resolution, run_job
+from render_daemon import warm_up
+
+def _check_job(job):
+    # Normaliza un trabajo del manifiesto; lanza ValueError si le falta algo o no tiene sentido
+    if not isinstance(job, dict):
+        raise ValueError("el trabajo no es un objeto JSON")
+    if job.get("angle") in (None, ""):
+        raise ValueError("falta el campo angle")
+    try:
+        job["angle"] = float(job["angle"])
+    except (TypeError, ValueError):
+        raise ValueError("angle no es un número: {!r}".format(job["angle"]))
+    vector = job.get("vector", [1, 0])
+    try:
+        x, y = vector
+        job["vector"] = [ float(x), float(y) ]
+    except (TypeError, ValueError):
+        raise ValueError("vector no son dos números: {!r}".format(vector))
+    if job.get("resolution"):
+        try:
+            parse_resolution(job["resolution"])
+        except (TypeError, ValueError):
+            raise ValueError("resolución no válida: {!r}".format(job["resolution"]))
+    job.setdefault("id", job_id(job))
+    return job
+
+def load_manifest(path):
+    """
+        Lee los trabajos de un manifiesto JSONL o CSV (según la extensión) y les asigna un id
+        (jobs.job_id: el nombre del vídeo si lo tienen o sus parámetros si no).
+
+        Se comprueba cada línea antes de empezar: si falta el ángulo, algún valor no es un número o
+        dos trabajos tienen el mismo id o el mismo vídeo, se lanza un ValueError con el fichero y la
+        línea del error.
+    """
+    lines = []
+    with open(path, newline = "") as f:
+        if path.endswith(".csv"):
+            reader = csv.DictReader(f)
+            for row in reader:
+                job = { "angle": row.get("angle") }
+                # Sin x ni y, el vector por defecto (como en JSONL)
+                if row.get("x") or row.get("y"):
+                    job["vector"] = [ row.get("x"), row.get("y") ]
+                for key in ("resolution", "output", "quality"):
+                    if row.get(key):
+                        job[key] = row[key]
+                lines.append((reader.line_num, job))
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    lines.append((number, json.loads(line)))
+                except ValueError as e:
+                    raise ValueError("{}:{}: JSON no válido: {}".format(path, number, e))
+
+    jobs = []
+    seen = {}
+    for number, job in lines:
+        try:
+            job = _check_job(job)
+        except ValueError as e:
+            raise ValueError("{}:{}: {}".format(path, number, e))
+        for key in ("id", "output"):
+            value = job.get(key) or job["id"]
+            if (key, value) in seen:
+                raise ValueError("{}:{}: {} repetido {!r} (ya está en la línea {})".format(
+                    path, number, key, value, seen[key, value]))
+            seen[key, value] = number
+        jobs.append(job)
+    return jobs
+
+def load_checkpoint(path):
+    """
+        Ids de los trabajos ya terminados en una ejecución anterior
+    """
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path) as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                # Última línea a medio escribir si se interrumpió el barrido
+                continue
+    return done
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+def _with_defaults(job, defaults):
+    # La calidad por defecto sólo es para los trabajos sin resolución: con resolución, Manim usaría
+    # también los fotogramas por segundo de esa calidad
+    if job.get("resolution"):
+        defaults = { key : value for key, value in defaults.items() if key != "quality" }
+    return dict(defaults, **job)
+
+def _cost(job):
+    # Estimación del tiempo de render: píxeles por segundo de vídeo (con la resolución que indique o
+    # la de su calidad)
+    width, height, fps = job_size(job)
+    return width*height*fps
+
+def run_sweep(jobs, checkpoint, workers = None, **defaults):
+    """
+        Renderiza los trabajos que no estén en el checkpoint y devuelve (terminados, fallidos).
+
+        Los trabajos se reparten de uno en uno (chunksize = 1) entre los procesos conforme van quedando
+        libres, empezando por los más largos, así que aunque las duraciones sean muy distintas ningún
+        proceso se queda parado mientras queden trabajos. Cada trabajo terminado se añade al checkpoint
+        (y se fuerza su escritura en disco), de modo que si se interrumpe el barrido basta con volver a
+        lanzarlo para continuar.
+
+        Parámetros
+        ----------------
+            jobs : lista de trabajos (ver load_manifest).
+            checkpoint : ruta del fichero JSONL con los trabajos terminados.
+            workers : número de procesos (por defecto, uno por CPU).
+            defaults : valores por defecto de los trabajos (quality, media_dir...). quality sólo se
+                          aplica a los que no indican resolución.
+    """
+    done = load_checkpoint(checkpoint)
+    pending = [ _with_defaults(job, defaults) for job in jobs if job["id"] not in done ]
+    pending.sort(key = _cost, reverse = True)
+    print("{} trabajos, {} ya terminados, {} pendientes".format(len(jobs), len(jobs) - len(pending), len(pending)))
+    if not pending:
+        return 0, 0
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    # Cargamos Manim y los glifos antes de crear los procesos para que los hereden
+    warm_up()
+    finished, failed = 0, 0
+    start = time.perf_counter()
+    with open(checkpoint, "a") as log, multiprocessing.get_context("fork").Pool(workers) as pool:
+        if log.tell() and not _ends_with_newline(checkpoint):
+            # La última línea quedó a medias: los nuevos resultados empiezan en otra línea
+            log.write("\n")
+        for result in pool.imap_unordered(run_job, pending, chunksize = 1):
+            if result["status"] == "ok":
+                finished += 1
+                log.write(json.dumps(result) + "\n")
+                log.flush()
+                os.fsync(log.fileno())
+            else:
+                failed += 1
+                print("Error en {}: {}".format(result["id"], result["error"]), file = sys.stderr)
+            elapsed = time.perf_counter() - start
+            print("[{}/{}] {} ({:.1f} s) - {:.2f} trabajos/min".format(
+                finished + failed, len(pending), result["id"], result.get("seconds", 0), 60*finished/elapsed))
+
+    elapsed = time.perf_counter() - start
+    print("{} terminados, {} fallidos en {:.1f} s ({:.2f} trabajos/min con {} procesos)".format(
+        finished, failed, elapsed, 60*finished/elapsed, workers))
+    return finished, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Renderiza un barrido de parámetros de Prueba")
+    parser.add_argument("manifest", help = "fichero JSONL o CSV con los trabajos")
+    parser.add_argument("--checkpoint", help = "trabajos terminados (por defecto, <manifest>.done.jsonl)")
+    parser.add_argument("-j", "--workers", type = int, help = "procesos (por defecto, uno por CPU)")
+    parser.add_argument("-q", "--quality", default = "low_quality",
+                        help = "calidad de Manim para los trabajos que no indican resolución")
+    parser.add_argument("--media-dir", help = "directorio de Manim")
+    args = parser.parse_args()
+
+    defaults = { "quality": args.quality }
+    if args.media_dir:
+        defaults["media_dir"] = args.media_dir
+    finished, failed = run_sweep(load_manifest(args.manifest), args.checkpoint or args.manifest + ".done.jsonl",
+                                 args.workers, **defaults)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+from manim import *
+
+from main import set_hidden_values
+from rotation import rotate_points
+
+def _hidden_matrix():
+    # Igual que vec_rot en create_matrix: 0 y 1 sin decimales, ocultos
+    matrix = DecimalMatrix([[0], [1]], element_to_mobject_config = { "num_decimal_places": 0 })
+    for el in matrix.elements: el.set_opacity(0)
+    return matrix
+
+@pytest.mark.parametrize("angle, text", [
+    (45, ["0.71", "0.71"]),
+    (180, ["-1", "0"]),
+    (-30, ["0.87", "-0.50"]),
+])
+def test_new_characters_stay_hidden(angle, text):
+    matrix = _hidden_matrix()
+    result = rotate_points((1, 0), angle)
+    set_hidden_values(matrix.elements, result)
+    for el, expected in zip(matrix.elements, text):
+        assert len(el.submobjects) == len(expected)
+        for member in el.family_members_with_points():
+            assert not (member.get_fill_opacities() > 0).any()
+            assert not (member.get_stroke_opacities() > 0).any()
+    np.testing.assert_allclose([ el.get_value() for el in matrix.elements ], result)
@@ -0,0 +1,44 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+from manim import *
+
+from parallel import ParallelScene
+
+pytestmark = pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason = "hace falta fork")
+
+class _Frames(ParallelScene):
+    # Guarda los fotogramas que llegarían al vídeo en lugar de escribirlos
+    parallel_min_frames = 0
+    parallel_chunk_frames = 3
+    workers = 1
+
+    def setup(self):
+        super().setup()
+        self.frames = []
+        self.renderer.file_writer.write_frame = lambda frame, *args, **kwargs: self.frames.append(np.array(frame))
+
+    def construct(self):
+        square = Square(color = BLUE, fill_opacity = 0.5)
+        self.add(square)
+        with self.parallel_frames(self.workers):
+            self.play(Rotate(square, PI/3), Create(Circle(color = RED)), square.animate.shift(RIGHT), run_time = 1)
+
+def _render(workers, tmp_path):
+    overrides = dict(quality = "low_quality", pixel_width = 160, pixel_height = 90, frame_rate = 15,
+                     write_to_movie = False, disable_caching = True, media_dir = str(tmp_path),
+                     progress_bar = "none", verbosity = "WARNING")
+    with tempconfig(overrides):
+        scene = type("Frames", (_Frames,), { "workers": workers })()
+        scene.render()
+    return scene.frames
+
+def test_parallel_frames_are_identical_to_serial(tmp_path):
+    serial = _render(1, tmp_path / "serial")
+    parallel = _render(3, tmp_path / "parallel")
+    assert len(serial) == len(parallel) > 0
+    for k, (a, b) in enumerate(zip(serial, parallel)):
+        assert np.array_equal(a, b), "el fotograma {} es distinto".format(k)
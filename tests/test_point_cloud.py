@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+from manim import *
+
+from point_cloud import ArrowCloud, ArrowCloudCamera
+
+def _draw(camera_class, cloud):
+    with tempconfig(dict(pixel_width = 320, pixel_height = 180)):
+        camera = camera_class()
+        camera.capture_mobject(cloud)
+        return camera.pixel_array.astype(int)
+
+@pytest.mark.parametrize("angle", [0, 30, 90])
+def test_straight_path_draws_like_the_generic_one(angle):
+    cloud = ArrowCloud.grid(step = 0.5, length = 0.3, color = YELLOW).set_rotation(angle)
+    expected = _draw(Camera, cloud)
+    drawn = _draw(ArrowCloudCamera, cloud)
+    assert expected.any()
+    np.testing.assert_allclose(drawn, expected, atol = 2)
+
+def test_reshaped_cloud_falls_back_to_the_generic_path():
+    cloud = ArrowCloud.grid(step = 0.5, length = 0.3)
+    cloud.insert_n_curves(3)
+    np.testing.assert_array_equal(_draw(ArrowCloudCamera, cloud), _draw(Camera, cloud))
@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("manim")
+from manim import *
+
+from reclaim import ReclaimingScene
+
+class _Reclaim(ReclaimingScene):
+
+    def construct(self):
+        self.square = Square()
+        self.group = VGroup(Circle(), Triangle())
+        self.add(self.group)
+        # FadeIn es un Transform cuyo destino es el propio objeto
+        self.play(FadeIn(self.square), run_time = 0.2)
+        # FadeIn de una parte de un grupo que ya está en pantalla: la añade al primer nivel
+        self.part = VGroup(*self.group)
+        self.play(FadeIn(self.part), run_time = 0.2)
+        self.after_fade_in = list(self.mobjects)
+        # Una copia transformada en un objeto que se ve sí sobra
+        self.copy = self.square.copy().shift(LEFT)
+        self.play(Transform(self.copy, self.square), run_time = 0.2)
+
+def test_faded_in_mobjects_survive_and_transformed_copies_do_not(tmp_path):
+    overrides = dict(quality = "low_quality", pixel_width = 160, pixel_height = 90, frame_rate = 15,
+                     write_to_movie = False, disable_caching = True, media_dir = str(tmp_path),
+                     progress_bar = "none", verbosity = "WARNING")
+    with tempconfig(overrides):
+        scene = _Reclaim()
+        scene.render()
+    assert scene.square in scene.after_fade_in
+    assert scene.part in scene.after_fade_in
+    assert scene.square in scene.mobjects
+    assert scene.copy not in scene.mobjects
+    assert scene.reclaimed_mobjects == 1
@@ -0,0 +1,7 @@
+import render_daemon
+
+def test_submit_sends_zero_values(monkeypatch, capsys):
+    sent = []
+    monkeypatch.setattr(render_daemon, "submit", lambda job, socket_path: sent.append(job) or dict(status = "ok"))
+    assert render_daemon.main(["submit", "--angle", "0", "--vector", "0", "1"]) == 0
+    assert sent == [ dict(angle = 0.0, vector = [0.0, 1.0]) ]
@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+
+from rotation import compose, embed_rotation, rotate_points, rotation_matrices
+
+def test_scalar_angle_gives_single_matrix():
+    mat = rotation_matrices(30)
+    c, s = math.cos(math.radians(30)), math.sin(math.radians(30))
+    assert mat.shape == (2, 2)
+    np.testing.assert_allclose(mat, [[c, -s], [s, c]])
+
+def test_array_of_angles_keeps_its_shape():
+    angles = np.array([[0, 90, 180], [270, 45, -30]])
+    mats = rotation_matrices(angles)
+    assert mats.shape == (2, 3, 2, 2)
+    for idx in np.ndindex(angles.shape):
+        np.testing.assert_allclose(mats[idx], rotation_matrices(angles[idx]))
+
+def test_radians():
+    np.testing.assert_allclose(rotation_matrices(np.pi/3, degrees = False), rotation_matrices(60))
+
+@pytest.mark.parametrize("angle, expected", [
+    (90, [[0, -1], [1, 0]]),
+    (180, [[-1, 0], [0, -1]]),
+    (270, [[0, 1], [-1, 0]]),
+    (-90, [[0, 1], [-1, 0]]),
+])
+def test_multiples_of_90_are_exact_without_negative_zero(angle, expected):
+    mat = rotation_matrices(angle)
+    np.testing.assert_array_equal(mat, expected)
+    # -0.0 == 0.0, así que comprobamos el signo aparte
+    assert not np.any(np.signbit(mat[mat == 0]))
+
+def test_out_buffer_is_filled_and_returned():
+    out = np.full((3, 2, 2), np.nan)
+    res = rotation_matrices([0, 90, 180], out = out)
+    assert res is out
+    np.testing.assert_array_equal(out[1], [[0, -1], [1, 0]])
+
+def test_rotate_single_point():
+    res = rotate_points([1, 0], 90)
+    assert res.shape == (2,)
+    np.testing.assert_array_equal(res, [0, 1])
+
+def test_rotate_many_points_by_many_angles():
+    points = np.array([[1, 0], [0, 2], [3, 4]])
+    angles = np.array([0, 45, 90, 180])
+    res = rotate_points(points, angles)
+    assert res.shape == (4, 3, 2)
+    for a, angle in enumerate(angles):
+        np.testing.assert_allclose(res[a], points @ rotation_matrices(angle).T, atol = 1e-12)
+
+def test_rotate_points_out_buffer():
+    out = np.empty((2, 2))
+    res = rotate_points([[1, 0], [0, 1]], 90, out = out)
+    assert res is out
+    np.testing.assert_array_equal(out, [[0, 1], [-1, 0]])
+
+def test_rotation_preserves_length():
+    points = np.random.default_rng(0).normal(size = (100, 2))
+    res = rotate_points(points, 37.5)
+    np.testing.assert_allclose(np.linalg.norm(res, axis = 1), np.linalg.norm(points, axis = 1))
+
+def test_compose_adds_angles():
+    np.testing.assert_allclose(compose(30, 60), rotation_matrices(90), atol = 1e-12)
+    np.testing.assert_allclose(compose(30, 60), rotation_matrices(30) @ rotation_matrices(60), atol = 1e-12)
+
+def test_compose_broadcasts():
+    res = compose([10, 20, 30], 60)
+    assert res.shape == (3, 2, 2)
+    np.testing.assert_allclose(res, rotation_matrices([70, 80, 90]), atol = 1e-12)
+
+def test_embed_rotation():
+    mats = embed_rotation(rotation_matrices([90, 180]), 3)
+    assert mats.shape == (2, 3, 3)
+    np.testing.assert_array_equal(mats[0], [[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    np.testing.assert_array_equal(mats[1], [[-1, 0, 0], [0, -1, 0], [0, 0, 1]])
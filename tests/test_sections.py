@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("manim")
+from manim import *
+
+from sections import SectionCacheScene
+
+class _Sections(SectionCacheScene):
+    # Guarda la lista de vídeos parciales que se juntan en el vídeo final
+    state_attributes = ("square",)
+
+    def setup(self):
+        super().setup()
+        writer = self.renderer.file_writer
+        combine = writer.combine_to_movie
+
+        def combine_to_movie():
+            self.combined = [ f for f in writer.partial_movie_files if f is not None ]
+            return combine()
+
+        writer.combine_to_movie = combine_to_movie
+
+    def construct(self):
+        self.run_section("create_square")
+        self.run_section("move_square")
+        self.play(self.square.animate.rotate(PI/4), run_time = 0.2)
+
+    def create_square(self):
+        self.square = Square(color = BLUE)
+        self.play(Create(self.square), run_time = 0.2)
+        self.play(self.square.animate.scale(0.5), run_time = 0.2)
+
+    def move_square(self):
+        self.play(self.square.animate.shift(RIGHT), run_time = 0.2)
+
+def _render(tmp_path):
+    overrides = dict(quality = "low_quality", pixel_width = 160, pixel_height = 90, frame_rate = 15,
+                     media_dir = str(tmp_path), progress_bar = "none", verbosity = "WARNING")
+    with tempconfig(overrides):
+        scene = _Sections()
+        scene.render()
+    return scene
+
+def test_restored_sections_are_in_the_final_movie(tmp_path):
+    first = _render(tmp_path)
+    assert first.section_stats == dict(hits = 0, misses = 2)
+    second = _render(tmp_path)
+    assert second.section_stats == dict(hits = 2, misses = 0)
+    assert len(first.combined) == 4
+    assert second.combined == first.combined
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+import sweep
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+def test_jsonl_ids_from_output_or_parameters(tmp_path):
+    path = write(tmp_path, "barrido.jsonl",
+                 '{"angle": 45, "vector": [1, 0], "output": "giro45"}\n'
+                 '\n'
+                 '{"angle": 30, "resolution": "1280x720"}\n'
+                 '{"angle": 30.5, "vector": [2, -1], "id": "propio"}\n')
+    jobs = sweep.load_manifest(path)
+    assert [ job["id"] for job in jobs ] == ["giro45", "giro_30_1_0_1280x720", "propio"]
+    assert jobs[1]["vector"] == [1.0, 0.0]
+
+def test_csv_ids_match_jsonl(tmp_path):
+    csv_path = write(tmp_path, "barrido.csv",
+                     "angle,x,y,resolution,output\n"
+                     "45,1,0,,giro45\n"
+                     "30,1,0,1280x720,\n"
+                     "30.5,2,-1,,\n")
+    jsonl_path = write(tmp_path, "barrido.jsonl",
+                       '{"angle": 45, "vector": [1, 0], "output": "giro45"}\n'
+                       '{"angle": 30, "vector": [1, 0], "resolution": "1280x720"}\n'
+                       '{"angle": 30.5, "vector": [2, -1]}\n')
+    from_csv = sweep.load_manifest(csv_path)
+    from_jsonl = sweep.load_manifest(jsonl_path)
+    assert [ job["id"] for job in from_csv ] == ["giro45", "giro_30_1_0_1280x720", "giro_30.5_2_-1"]
+    assert [ job["id"] for job in from_csv ] == [ job["id"] for job in from_jsonl ]
+    assert from_csv[2]["angle"] == 30.5 and from_csv[2]["vector"] == [2.0, -1.0]
+
+@pytest.mark.parametrize("line, message", [
+    ('{"vector": [1, 0]}', "falta el campo angle"),
+    ('{"angle": "mucho"}', "angle no es un número"),
+    ('{"angle": 45, "vector": [1]}', "vector no son dos números"),
+    ('{"angle": 45, "resolution": "grande"}', "resolución no válida"),
+    ('{"angle": 45', "JSON no válido"),
+    ('[45, 1, 0]', "no es un objeto JSON"),
+])
+def test_bad_jsonl_line_reports_file_and_line(tmp_path, line, message):
+    path = write(tmp_path, "barrido.jsonl", '{"angle": 10}\n\n' + line + "\n")
+    with pytest.raises(ValueError, match = message) as info:
+        sweep.load_manifest(path)
+    assert str(info.value).startswith(path + ":3:")
+
+def test_bad_csv_line_reports_line(tmp_path):
+    path = write(tmp_path, "barrido.csv", "angle,x,y\n10,1,0\n,1,0\n")
+    with pytest.raises(ValueError, match = r":3: falta el campo angle"):
+        sweep.load_manifest(path)
+
+def test_repeated_ids_are_rejected(tmp_path):
+    path = write(tmp_path, "barrido.jsonl",
+                 '{"angle": 45, "output": "giro"}\n'
+                 '{"angle": 45}\n'
+                 '{"angle": 90, "output": "giro"}\n')
+    with pytest.raises(ValueError, match = r":3: id repetido 'giro' \(ya está en la línea 1\)"):
+        sweep.load_manifest(path)
+
+def test_checkpoint_ignores_truncated_last_line(tmp_path):
+    path = write(tmp_path, "barrido.done.jsonl",
+                 '{"status": "ok", "id": "a"}\n'
+                 '{"status": "ok", "id": "b"}\n'
+                 '{"status": "ok", "i')
+    assert sweep.load_checkpoint(path) == {"a", "b"}
+
+def test_missing_checkpoint_is_empty(tmp_path):
+    assert sweep.load_checkpoint(str(tmp_path / "no_existe.jsonl")) == set()
+
+def fake_run_job(job):
+    return dict(status = "ok", id = job["id"], seconds = 0.0, quality = job.get("quality"))
+
+def test_resume_only_runs_pending_jobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, "warm_up", lambda: None)
+    monkeypatch.setattr(sweep, "run_job", fake_run_job)
+    jobs = [ dict(angle = angle, vector = [1, 0], id = name) for angle, name in ((10, "a"), (20, "b"), (30, "c")) ]
+    checkpoint = write(tmp_path, "barrido.done.jsonl", '{"status": "ok", "id": "a"}\n{"status": "ok", "id": "b"')
+
+    assert sweep.run_sweep(jobs, checkpoint, workers = 2, quality = "low_quality") == (2, 0)
+    with open(checkpoint) as f:
+        lines = f.read().splitlines()
+    ran = [ json.loads(line) for line in lines[2:] ]
+    assert sorted(result["id"] for result in ran) == ["b", "c"]
+    assert all(result["quality"] == "low_quality" for result in ran)
+    assert sweep.load_checkpoint(checkpoint) == {"a", "b", "c"}
+
+    # Una segunda ejecución no tiene nada que hacer
+    assert sweep.run_sweep(jobs, checkpoint, workers = 2) == (0, 0)
+
+def test_default_quality_only_applies_without_resolution(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, "warm_up", lambda: None)
+    monkeypatch.setattr(sweep, "run_job", fake_run_job)
+    jobs = [ dict(angle = 10, vector = [1, 0], id = "a"),
+             dict(angle = 20, vector = [1, 0], id = "b", resolution = "1280x720"),
+             dict(angle = 30, vector = [1, 0], id = "c", resolution = "1280x720", quality = "high_quality") ]
+    checkpoint = str(tmp_path / "barrido.done.jsonl")
+
+    assert sweep.run_sweep(jobs, checkpoint, workers = 1, quality = "low_quality") == (3, 0)
+    with open(checkpoint) as f:
+        quality = { result["id"] : result["quality"] for result in map(json.loads, f) }
+    assert quality == dict(a = "low_quality", b = None, c = "high_quality")
+
+def test_csv_without_vector_columns_uses_the_default(tmp_path):
+    path = write(tmp_path, "barrido.csv", "angle,output\n45,giro45\n")
+    assert sweep.load_manifest(path)[0]["vector"] == [1.0, 0.0]
+
+def test_longest_jobs_first_by_resolution_or_quality():
+    jobs = [ dict(id = "baja", quality = "low_quality"),
+             dict(id = "media", quality = "medium_quality"),
+             dict(id = "720p60", resolution = "1280x720"),
+             dict(id = "alta") ]
+    assert [ job["id"] for job in sorted(jobs, key = sweep._cost, reverse = True) ] == ["alta", "720p60", "media", "baja"]
+
+def test_run_job_returns_errors_with_the_job_id():
+    result = sweep.run_job(dict(id = "sin_angulo"))
+    assert result["status"] == "error" and result["id"] == "sin_angulo"
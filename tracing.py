@@ -0,0 +1,107 @@
+# Trazas de cada self.play/self.wait en formato Chrome trace (chrome://tracing, Perfetto...)
+from manim import *
+import json
+import os
+import sys
+import time
+
+# Las llamadas hechas desde estos ficheros no se toman como origen de una animación
+_SKIP_FILES = (os.path.dirname(sys.modules["manim"].__file__), os.path.abspath(__file__))
+
+def _caller():
+    # Primer fotograma de la pila fuera de Manim y de las escenas auxiliares
+    frame = sys._getframe(2)
+    while frame is not None and os.path.abspath(frame.f_code.co_filename).startswith(_SKIP_FILES):
+        frame = frame.f_back
+    if frame is None:
+        return "?", "?", 0
+    return frame.f_code.co_name, os.path.basename(frame.f_code.co_filename), frame.f_lineno
+
+class TracingScene(Scene):
+    """
+        Escena que, si se activa, mide cada self.play y self.wait y guarda una traza en formato Chrome
+        trace. Por cada animación se guarda el método y la línea desde donde se llamó, los tipos de
+        animación, el número de fotogramas, el tiempo dedicado a actualizar los objetos, a dibujarlos
+        (rasterizar) y a escribirlos en el vídeo (codificar), y el número de objetos en escena.
+
+        Se activa con la variable de entorno PRUEBA_TRACE (o el atributo de clase trace_file) con la
+        ruta del fichero de la traza. Si no se activa no se modifica nada.
+    """
+    trace_file = None
+
+    def setup(self):
+        self.trace_file = self.trace_file or os.environ.get("PRUEBA_TRACE")
+        # Eventos de la traza (None si la traza no está activada)
+        self.trace_events = None
+        # Tiempos de la animación en curso
+        self._current = None
+        if self.trace_file:
+            # Se envuelven los métodos originales antes de que el resto de escenas pongan los suyos
+            # encima: así StreamingEncoderScene escribe desde su hilo con la versión medida, y el
+            # tiempo de DedupScene al comparar fotogramas no cuenta como tiempo de dibujo
+            self.trace_events = []
+            self._wrap(self, "update_to_time", "update")
+            self._wrap(self.renderer, "update_frame", "rasterize")
+            self._wrap(self.renderer.file_writer, "write_frame", "encode")
+        super().setup()
+
+    def _wrap(self, obj, name, bucket):
+        original = getattr(obj, name)
+
+        def wrapper(*args, **kwargs):
+            # La animación en curso se lee al empezar: la escritura puede hacerse desde otro hilo
+            current = self._current
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if current is not None:
+                    current[bucket] += time.perf_counter() - start
+
+        setattr(obj, name, wrapper)
+
+    def play(self, *args, **kwargs):
+        # Las llamadas anidadas (self.wait llama a self.play) se cuentan una sola vez
+        if self.trace_events is None or self._current is not None:
+            return super().play(*args, **kwargs)
+
+        method, filename, line = _caller()
+        animations = [ type(anim).__name__ if isinstance(anim, Animation) else "animate" for anim in args ]
+        self._current = dict(update = 0.0, rasterize = 0.0, encode = 0.0)
+        video_start = self.renderer.time
+        start = time.perf_counter()
+        try:
+            return super().play(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            times, self._current = self._current, None
+            frames = int(round((self.renderer.time - video_start) * config.frame_rate))
+            self.trace_events.append(dict(
+                name = "{}:{} {}".format(method, line, "+".join(animations)),
+                cat = "wait" if animations == ["Wait"] else "play",
+                ph = "X",
+                ts = start * 1e6,
+                dur = (end - start) * 1e6,
+                pid = os.getpid(),
+                tid = 0,
+                args = dict(
+                    method = method,
+                    file = filename,
+                    line = line,
+                    animations = animations,
+                    frames = frames,
+                    update_ms = times["update"] * 1e3,
+                    rasterize_ms = times["rasterize"] * 1e3,
+                    encode_ms = times["encode"] * 1e3,
+                    # Si el vídeo se escribe en otro hilo, esa escritura se solapa con el resto
+                    other_ms = max(end - start - sum(times.values()), 0) * 1e3,
+                    mobjects = len(self.get_mobject_family_members()),
+                ),
+            ))
+
+    def tear_down(self):
+        super().tear_down()
+        if self.trace_events is not None:
+            with open(self.trace_file, "w") as f:
+                json.dump(dict(traceEvents = self.trace_events, displayTimeUnit = "ms"), f)
+            logger.info("Traza guardada en %s (%d animaciones)", self.trace_file, len(self.trace_events))